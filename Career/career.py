@@ -5,27 +5,50 @@
 
 ### Imports
 from __future__ import annotations
-from random import random, choice, choices, randint, normalvariate, betavariate
+from random import random, choice
+from bisect import bisect, bisect_left, insort
+from heapq import nlargest
+from itertools import accumulate, islice, product
+from numpy.random import default_rng, Generator, SeedSequence
 from questionary import select as questionary, Choice
 from yaml import safe_load, safe_dump, YAMLError
+from pickle import dumps, loads, HIGHEST_PROTOCOL, UnpicklingError
+from zlib import compress, decompress, error as ZlibError
+from concurrent.futures import ProcessPoolExecutor, Future, wait, FIRST_COMPLETED
+from concurrent.futures.process import BrokenProcessPool
+from multiprocessing import get_context, get_all_start_methods
+from multiprocessing.context import BaseContext
 from colorama import just_fix_windows_console
 from pathvalidate import is_valid_filename
-from typing import Any, Callable, ClassVar
+from typing import Any, Callable, ClassVar, Iterable, Iterator
 from rich.progress import Progress, TaskID
 from xml.parsers.expat import ExpatError
 from traceback import format_exc
-from sys import exit as fullExit
+from sys import exit as fullExit, argv, stderr
 from datetime import datetime
 from hashlib import sha3_224
-from time import sleep, time
+from time import sleep, time, perf_counter
+from statistics import mean, median, stdev
+from json import dump as dumpJSON, load as loadJSON, JSONDecodeError
+from threading import Thread, Lock, RLock, current_thread
+from array import array
+from re import compile as compileRegex, escape as escapeRegex, Pattern, Match
+from types import SimpleNamespace
+from string import ascii_uppercase, digits
+from shutil import copyfile
+from gc import collect
+from tracemalloc import start as startTracing, stop as stopTracing, get_traced_memory as tracedMemory
+
+import numpy as np
 
 from prompt_toolkit import print_formatted_text, prompt
-from prompt_toolkit.completion import WordCompleter
+from prompt_toolkit.completion import Completer, Completion, CompleteEvent
+from prompt_toolkit.document import Document
 from prompt_toolkit.formatted_text import HTML
 from prompt_toolkit.styles import Style
 
-from os import name as osName, system, listdir, chdir, get_terminal_size as terminalSize
-from os.path import getmtime, exists, dirname, abspath
+from os import name as osName, system, listdir, chdir, makedirs, remove, cpu_count as cpuCount, get_terminal_size as terminalSize
+from os.path import getmtime, getsize, exists, dirname, abspath, basename
 
 # from pprint import pprint
 # import matplotlib.pyplot as plt
@@ -35,11 +58,12 @@ from os.path import getmtime, exists, dirname, abspath
 
 ### File variables
 
+GAME_DIRECTORY = dirname(abspath(__file__)).replace('\\', '/') + '/'
 dirs = {
-    'db': 'database/',
-    'saves': 'saves/',
-    'setups': 'setups/',
-    'custom': 'customisation/',
+    'db': GAME_DIRECTORY + 'database/',
+    'saves': GAME_DIRECTORY + 'saves/',
+    'setups': GAME_DIRECTORY + 'setups/',
+    'custom': GAME_DIRECTORY + 'customisation/',
 }
 files = {
     'settings': dirs['custom'] + 'settings.db',
@@ -52,9 +76,17 @@ files = {
     'frames': dirs['db'] + 'frames.db',
 }
 comments = {file: '' for file in files.keys()}
+preloadedData: dict[str, Future] = {}
+lazyWorld = False
 dbFiles = {a: b for a, b in files.items() if dirs['db'] in b}
 FILE_EXTENSION = '.plc'
 DATABASE_FILE_EXTENSION = '.db'
+CACHE_DIRECTORY = GAME_DIRECTORY + 'cache/'
+CACHE_FILE_EXTENSION = '.cache'
+WORLD_FILE = dirs['saves'] + 'world.wld'
+BENCHMARK_RESULTS_FILE = CACHE_DIRECTORY + 'benchmark-results.json'
+BENCHMARK_BASELINE_FILE = CACHE_DIRECTORY + 'benchmark-baseline.json'
+FRAME_STORE_EXTENSION = '.frames'
 
 ### Constants
 
@@ -84,14 +116,33 @@ MIN_CLUB_RATING = 27
 MAX_CLUB_RATING = 87
 FREE_AGENT_CHANCE = 0.3
 FREE_AGENT_AVERAGE_RATING = 45
+FREE_AGENT_NATION_COUNT = 211
 
 SECONDARY_POSITION_KOE = 1
 
+WORLD_VERSION = 1
+FRAME_STORE_VERSION = 1
+FRAME_STORE_HEADER_SIZE = 1024
+PRELOAD_POOL_MIN_SIZE = 256 * 1024 # Bytes to parse besides the biggest file before a process pool is faster than parsing in one process
+
 MIN_NAME_LENGTH = 2
 MAX_NAME_LENGTH = 25
 MIN_CLUB_NAME_LENGTH = 2
 CLUB_SHORT_NAME_LENGTH = 3
 
+SEARCH_LIMIT = 10
+MARKUP_CACHE_SIZE = 100000
+NUMBER_SETTING_VALUE = 'Number'
+NUMBER_OPTIONS = ['--seed', '--scale', '--repeats']
+USAGE = '''Usage: python career.py [--database DIRECTORY] [--seed NUMBER]
+       python career.py --generate-database DIRECTORY [--scale NUMBER] [--seed NUMBER]
+       python career.py --benchmark [--repeats NUMBER] [--save-baseline] | --benchmark-startup | --benchmark-world | --benchmark-memory'''
+
+BENCHMARK_REPEATS = 5
+BENCHMARK_SEED = 0
+BENCHMARK_TABLE_ROWS = 1000
+BENCHMARK_TOLERANCE = .1
+
 DEV_MODE = True
 
 ### Decorators
@@ -108,9 +159,19 @@ def timer(func):
         return result
     return wrapper
 
+def buffered(func):
+    '''
+    Collects everything a function prints and writes it to the terminal at once when it finishes (see `OutputBuffer`).
+    '''
+    def wrapper(*args: Any, **kwargs: Any) -> Any:
+        with OutputBuffer():
+            return func(*args, **kwargs)
+    wrapper.__name__, wrapper.__doc__ = func.__name__, func.__doc__
+    return wrapper
+
 ### Text functions
 
-def input(*message: Any, sep: str = ' ', default: str = "", completer: WordCompleter | None = None) -> str:
+def input(*message: Any, sep: str = ' ', default: str = "", completer: Completer | None = None) -> str:
     '''
     Like traditional `input()` but supports colored text in prompt_toolkit's HTML format.\n
     Can print strings, integers, tuples, etc., but not objects.\n
@@ -118,8 +179,9 @@ def input(*message: Any, sep: str = ' ', default: str = "", completer: WordCompl
     Returns the string that the user inputs.
     '''
     message: str = sep.join([str(part) for part in message])
+    OutputBuffer.flush()
     try:
-        return prompt(HTML(message), style = mainStyle, default = default, completer = completer)
+        return prompt(HTML(message), style = mainStyle, default = default, completer = completer, complete_in_thread = completer is not None)
     except (ExpatError, NameError, ValueError, TypeError, AttributeError):
         return origInput(message)
 
@@ -130,6 +192,9 @@ def print(*values: Any, sep: str = ' ', end: str = '\n') -> None:
     Be careful when printing anything that contains < and > as these may cause an error in prompt_toolkit.
     '''
     values: str = sep.join([str(part) for part in values])
+    if OutputBuffer.depth:
+        OutputBuffer.fragments.append((values, end))
+        return
     try:
         print_formatted_text(HTML(values), end = end, style = mainStyle)
     except (NameError, ValueError, TypeError, AttributeError):
@@ -137,11 +202,8 @@ def print(*values: Any, sep: str = ' ', end: str = '\n') -> None:
 
 def richFormat(text: str) -> str:
     '''Formats prompt_toolkit's HTML formatted text to match Rich formatting.'''
-    toReplace = {f'<{code}>': f'[{color.replace("bg:", "on ")}]' for code, color in mainStyleDict.items()}
-    toReplace.update({f'</{code}>': '[/]' for code in mainStyleDict.keys()})
-    for old, new in toReplace.items():
-        text = text.replace(old, new)
-    return text
+    Markup.update()
+    return Markup.pattern.sub(Markup.richTag, text)
 
 def colorDoubleText(text: str, color: str) -> list[str]:
     '''Like `colorText()` but returns a list of 2 elements: colored usual text and colored capitalised text.'''
@@ -149,12 +211,15 @@ def colorDoubleText(text: str, color: str) -> list[str]:
 
 def uncolor(text: str) -> str:
     '''Deletes all HTML color codes from `text`.'''
-    try:
-        for code in mainStyleDict.keys():
-            text = text.replace(f'<{code}>', '').replace(f'</{code}>', '')
-    except NameError:
-        pass
-    return text
+    if Markup.update() and text not in Markup.uncolored:
+        if len(Markup.uncolored) >= MARKUP_CACHE_SIZE:
+            Markup.uncolored.clear()
+        Markup.uncolored[text] = Markup.pattern.sub('', text)
+    return Markup.uncolored.get(text, text)
+
+def textWidth(text: str) -> int:
+    '''Returns the visible width of `text`, that is the length of `text` without HTML color codes.'''
+    return len(uncolor(text))
 
 def alignText(text: str, width: int, align: str, fill: str = ' ', autoFix: bool = True) -> str:
     f'''
@@ -166,7 +231,7 @@ def alignText(text: str, width: int, align: str, fill: str = ' ', autoFix: bool
     '''
     if fill != ' ' and text and autoFix:
         text = f'{" " if align in ["center", "right"] else ""}{text}{" " if align in ["center", "left"] else ""}'
-    newWidth = width + len(text) - len(uncolor(text))
+    newWidth = width + len(text) - textWidth(text)
     match align.lower():
         case 'left':
             text = text.ljust(newWidth, fill)
@@ -183,7 +248,8 @@ def colorSettingValue(value: str, mode: str = 'html') -> str | list[str]:
     Returns colored `value` (Yes in green for Yes, No in red for No, etc).\n
     `mode` must be 'html' or 'color'.\n
     If `mode` is 'html' (default), returns `value` that is colored using prompt_toolkit's HTML format.\n
-    If `mode` is 'color', returns [`value`, `color`], where `color` is 'green', for example.
+    If `mode` is 'color', returns [`value`, `color`], where `color` is 'green', for example.\n
+    Values other than Yes and No are yellow.
     '''
     match mode:
         case 'html':
@@ -191,16 +257,19 @@ def colorSettingValue(value: str, mode: str = 'html') -> str | list[str]:
                 return f'<ugreen>{value}</ugreen>'
             if value.lower() == 'no':
                 return f'<ured>{value}</ured>'
+            return f'<uyellow>{value}</uyellow>'
         case 'color':
             if value.lower() == 'yes':
                 return [value, 'green']
             if value.lower() == 'no':
                 return [value, 'red']
+            return [value, 'yellow']
         case _:
             raise ValidationError(f'colorSettingValue(): mode must be "html" or "color", not {mode}.')
 
 def clear() -> None:
     '''Clears the terminal.'''
+    OutputBuffer.flush()
     if osName == 'nt':
         system('cls')
     else:
@@ -227,28 +296,207 @@ def saveData(filePath: str, data: Any, allowExceptions: bool = False) -> bool:
             raise SaveLoadError(f'Failed to save data to {filePath}:\n{e}\n')
         return False
     
-def loadData(filePath: str, allowExceptions: bool = True, modifyComments: bool = False) -> Any | bool:
+def loadData(filePath: str, allowExceptions: bool = True, modifyComments: bool = False, useCache: bool = True) -> Any | bool:
     '''
     Loads data in YAML from `filePath`.\n
     Returns the data if loading was successful or False if there was an error.\n
     Raises an Exception instead of returning False if `allowException` is True.\n
-    Saves the first comment (must start on character 1 of the file) to the `comments` dictionary if `modifyComments` is True.
+    Saves the first comment (must start on character 1 of the file) to the `comments` dictionary if `modifyComments` is True.\n
+    Database files are loaded from their cache if `useCache` is True and the cache is still valid (see `loadCache()`).
+    If the file was preloaded with `preloadFiles()`, waits for the result instead of parsing the file again.
     '''
     try:
-        with open(filePath, 'r', encoding = 'utf-8') as f:
-            contents = f.read()
-            splitContents = contents.splitlines()
-            for commentLength, line in enumerate(splitContents):
-                if not line or line[0] != '#':
-                    break
-            if modifyComments and commentLength:
-                comments['.'.join(filePath.split('/')[-1].split('.')[:-1])] = '\n'.join(splitContents[:commentLength])
-            return safe_load(contents)
-    except (FileNotFoundError, OSError, YAMLError) as e:
+        if filePath in preloadedData:
+            comment, data = preloadedData.pop(filePath).result()
+        else:
+            comment, data = readData(filePath, useCache)
+        if modifyComments and comment:
+            comments['.'.join(filePath.split('/')[-1].split('.')[:-1])] = comment
+        return data
+    except (FileNotFoundError, OSError, UnicodeDecodeError, YAMLError, BrokenProcessPool) as e:
         if allowExceptions:
             raise SaveLoadError(f'File not found: {filePath}' if isinstance(e, FileNotFoundError) else f'Failed to load data from {filePath}:\n{e}\n')
         return False
 
+def readData(filePath: str, useCache: bool = True) -> tuple[str, Any]:
+    '''
+    Reads `filePath` and returns its first comment and its data parsed from YAML. Does not handle any errors.\n
+    Database files are loaded from their cache if `useCache` is True and the cache is still valid (see `loadCache()`).
+    '''
+    with open(filePath, 'rb') as f:
+        rawContents = f.read()
+    contents = rawContents.decode('utf-8')
+    splitContents = contents.splitlines()
+    commentLength = 0
+    for commentLength, line in enumerate(splitContents):
+        if not line or line[0] != '#':
+            break
+    comment = '\n'.join(splitContents[:commentLength])
+    if not useCache or not filePath.endswith(DATABASE_FILE_EXTENSION):
+        return comment, safe_load(contents)
+    key = yamlToHash(rawContents)
+    data = loadCache(filePath, key)
+    if data is None:
+        data = safe_load(contents)
+        saveCache(filePath, key, data)
+    return comment, data
+
+def processContext() -> BaseContext:
+    '''
+    Returns the multiprocessing context that process pools are started with: forkserver where it is available, spawn otherwise.\n
+    Pools are started from the thread of the `BackgroundLoader` while the main thread is running, and a process forked from a process with several threads can deadlock
+    if another thread holds a lock at that moment.
+    '''
+    return get_context('forkserver' if 'forkserver' in get_all_start_methods() else 'spawn')
+
+def preloadFiles(filePaths: list[str], bar: Progress | None = None) -> None:
+    '''
+    Starts loading every file in `filePaths` so that `loadData()` can pick up the results later.\n
+    Files that have to be parsed are parsed concurrently in a process pool, biggest first, so the time it takes is bounded by the slowest file.
+    Starting the pool takes a while, so it is only used on machines with several CPUs when there are at least `PRELOAD_POOL_MIN_SIZE` bytes to parse besides the biggest file.
+    Files with a valid cache, and all files when the pool is not used, are loaded right away.\n
+    If `bar` is not None, adds a task to it for every file which is completed when the file is loaded.
+    '''
+    toParse: list[str] = []
+    filePaths = [filePath for filePath in dict.fromkeys(filePaths) if not (filePath == files['frames'] and FrameStore.isCompiled(filePath))]
+    for filePath in filePaths:
+        try:
+            if isCached(filePath):
+                continue
+        except OSError:
+            pass
+        toParse.append(filePath)
+    sizes = {filePath: getsize(filePath) if exists(filePath) else 0 for filePath in toParse}
+    try:
+        pool = ProcessPoolExecutor(min(len(toParse), cpuCount()), mp_context = processContext()) if (cpuCount() or 1) > 1 and sum(sizes.values()) - max(sizes.values(), default = 0) >= PRELOAD_POOL_MIN_SIZE else None
+    except (OSError, NotImplementedError, ValueError):
+        pool = None
+    for filePath in sorted(toParse, key = sizes.__getitem__, reverse = True) if pool else []:
+        preloadedData[filePath] = pool.submit(readData, filePath)
+    for filePath in dict.fromkeys(filePaths):
+        future: Future = preloadedData[filePath] if pool and filePath in toParse else Future()
+        if not (pool and filePath in toParse):
+            try:
+                future.set_result(readData(filePath))
+            except (OSError, UnicodeDecodeError, YAMLError) as e:
+                future.set_exception(e)
+        if bar:
+            fileTask = bar.add_task(f'[green]Loading {filePath}...', total = 1)
+            future.add_done_callback(lambda _, fileTask = fileTask: bar.update(fileTask, advance = 1))
+        preloadedData[filePath] = future
+    if pool:
+        pool.shutdown(wait = False)
+
+def cacheFileName(filePath: str) -> str:
+    '''Returns the name that the cache files of `filePath` start with. `database/frames.db` -> `database-frames.db`. Paths in `GAME_DIRECTORY` are made relative to it.'''
+    return filePath.removeprefix(GAME_DIRECTORY).replace(SLASH, '-').replace(':', '-')
+
+def cachePath(filePath: str) -> str:
+    '''Returns the path of the cache file of `filePath`. `database/frames.db` -> `cache/database-frames.db.cache`.'''
+    return CACHE_DIRECTORY + cacheFileName(filePath) + CACHE_FILE_EXTENSION
+
+def isCached(filePath: str) -> bool:
+    '''Returns True if `filePath` has a cache that matches its current contents, False otherwise. Does not load the cache.'''
+    with open(filePath, 'rb') as f:
+        key = yamlToHash(f.read())
+    try:
+        with open(cachePath(filePath), 'rb') as f:
+            return f.readline().rstrip(b'\n') == key.encode()
+    except OSError:
+        return False
+
+def loadCache(filePath: str, key: str) -> Any | None:
+    '''
+    Returns the cached parsed data of `filePath` if the cache exists and was created from contents hashed to `key`.\n
+    Returns None if there is no valid cache, in which case the file has to be parsed again.
+    '''
+    try:
+        with open(cachePath(filePath), 'rb') as f:
+            if f.readline().rstrip(b'\n') != key.encode():
+                return None
+            return loads(f.read())
+    except (OSError, EOFError, ValueError, TypeError, UnpicklingError):
+        return None
+
+def saveCache(filePath: str, key: str, data: Any) -> bool:
+    '''
+    Saves the parsed `data` of `filePath` to its cache. The first line of the cache is `key` (the hash of the file's contents).\n
+    Returns True if saving was successful or False otherwise. A failed save only means that the next launch will be slower.
+    '''
+    try:
+        makedirs(CACHE_DIRECTORY, exist_ok = True)
+        with open(cachePath(filePath), 'wb') as f:
+            f.write(key.encode() + b'\n' + dumps(data, HIGHEST_PROTOCOL))
+        return True
+    except (OSError, TypeError, ValueError):
+        return False
+
+def clearCache(filePaths: list[str]) -> None:
+    '''Deletes the cache of every file in `filePaths`. The caches will be rebuilt the next time the files are loaded.'''
+    for filePath in filePaths:
+        if exists(cachePath(filePath)):
+            remove(cachePath(filePath))
+
+def worldKey() -> str:
+    '''Returns the hash of `WORLD_VERSION` and all database files that a world is generated from. A saved world is only valid if its key matches.'''
+    contents = bytes(str(WORLD_VERSION), 'utf8')
+    for fileName in ['nations', 'names', 'leagues', 'positions', 'traits', 'frames']:
+        with open(files[fileName], 'rb') as f:
+            contents += f.read()
+    return yamlToHash(contents)
+
+def saveWorld(filePath: str = WORLD_FILE) -> bool:
+    '''
+    Saves the generated world (all players, club squads and free agents) to `filePath`, so it doesn't have to be generated on the next launch.
+
+    Nations, leagues and clubs aren't saved as they are created from the database anyway. Players are saved as records (see `Player.toRecord()`).
+
+    Returns True if saving was successful or False otherwise.
+    '''
+    playerIndices = {id(player): i for i, player in enumerate(Player.instances)}
+    world = {
+        'key': worldKey(),
+        'seed': Streams.seed,
+        'players': [player.toRecord() for player in Player.instances],
+        'clubs': [[playerIndices[id(player)] for player in club.players] for club in Club.instances],
+        'freeAgents': [playerIndices[id(player)] for player in freeAgents.players],
+        'freeAgentNation': [playerIndices[id(player)] for player in freeAgents.nation.players],
+    }
+    try:
+        with open(filePath, 'wb') as f:
+            f.write(compress(dumps(world, HIGHEST_PROTOCOL), 1))
+        return True
+    except (OSError, TypeError, ValueError):
+        return False
+
+def loadWorld(filePath: str = WORLD_FILE) -> dict[str, Any] | None:
+    '''
+    Loads a world saved with `saveWorld()` from `filePath`.
+
+    Returns None if there is no saved world, it is corrupted, it was generated from a different database or from a different seed than the requested one (see `requestedSeed()`).
+    '''
+    try:
+        with open(filePath, 'rb') as f:
+            world = loads(decompress(f.read()))
+        seed = requestedSeed()
+        return world if world['key'] == worldKey() and (seed is None or world.get('seed') == seed) else None
+    except (OSError, EOFError, ValueError, TypeError, KeyError, UnpicklingError, ZlibError):
+        return None
+
+def restoreWorld(world: dict[str, Any]) -> None:
+    '''Creates all players from a `world` loaded with `loadWorld()` and puts them into their clubs. All clubs must already exist.'''
+    players = [Player.fromRecord(record) for record in world['players']]
+    for club, playerIndices in zip(Club.instances + [freeAgents], world['clubs'] + [world['freeAgents']]):
+        club.players = [players[i] for i in playerIndices]
+        for player in club.players:
+            player.club = club
+    freeAgents.nation.players = [players[i] for i in world['freeAgentNation']]
+
+def deleteWorld(filePath: str = WORLD_FILE) -> None:
+    '''Deletes the saved world, so a new one is generated the next time the database is parsed.'''
+    if exists(filePath):
+        remove(filePath)
+
 def dataToYAML(data: Any) -> bytes:
     '''Transforms `data` to YAML.'''
     return safe_dump(data, encoding = 'utf-8', allow_unicode = True, sort_keys = False)
@@ -278,92 +526,315 @@ def getFiles(directory: str, extensions: list[str] = [FILE_EXTENSION, DATABASE_F
     '''Returns all flies from the given directory that share an extension with th given extensions.'''
     return [file for file in listdir(directory) if '.' + file.split('.')[-1] in extensions or not extensions]
 
-def parseDatabase(pathsToCheck: list[str], funcsToCheck: list[Callable], outputsToReturn: list[str] = [], progressValues: list[int] = [2 for _ in range(len(files.values()))]) -> list:
+def setDatabaseDirectory(directory: str) -> None:
+    '''Points `dirs['db']` and the database files in `files` and `dbFiles` at `directory`, so that the world is made from another database.'''
+    dirs['db'] = abspath(directory).replace('\\', SLASH) + SLASH
+    for name, filePath in dbFiles.items():
+        files[name] = dbFiles[name] = dirs['db'] + basename(filePath)
+
+def generateDatabase(directory: str, scale: int, seed: int = 0) -> None:
     '''
-    Checks that all paths in `pathsToCheck` exist and calls each function in `funcsToCheck`.\n
-    Returns the output of a function if the file corresponding to it (taken from the files dictionary) is in `outputsToReturn`.
+    Writes a synthetic database `scale` times the size of the current one (see `dbFiles`) to `directory`, so that the game and the benchmarks can be tested on bigger worlds (see `setDatabaseDirectory()`).\n
+    The first copy of every nation and league is the original one. Every other copy gets its copy number appended to its names, which are cut to `MAX_NAME_LENGTH`,
+    new unique short names, the player names of the original nation and, for clubs, the original rating changed by a random amount from `seed` within `MIN_CLUB_RATING` and `MAX_CLUB_RATING`.
+    Copies of a nation come right after it in the FIFA ranking, so that every copy keeps about the same place relative to all nations as the original has, and copies of leagues are in the copy of their nation.
+    Positions, traits and frames are copied as they are.
+    '''
+    if scale < 1:
+        raise ValidationError(f'The scale of a database must be a whole number above 0, while it is {scale}.')
+    rng = default_rng(seed)
+    data: dict[str, Any] = {}
+    headers: dict[str, str] = {}
+    for name in ['nations', 'names', 'leagues']:
+        headers[name], data[name] = readData(dbFiles[name])
+    candidates = sorted([''.join(characters) for characters in product(ascii_uppercase + digits, repeat = CLUB_SHORT_NAME_LENGTH) if not ''.join(characters).isdigit()], key = lambda shortName: not shortName.isalpha())
+    usedShortNames = {'nations': {nation['shortName'].upper() for nation in data['nations']}, 'clubs': {club['shortName'].upper() for league in data['leagues'] for club in league['clubs']}}
+    unusedShortNames = {kind: [shortName for shortName in candidates if shortName not in used] for kind, used in usedShortNames.items()}
+    maxScale = min(len(unusedShortNames[kind]) // len(used) + 1 for kind, used in usedShortNames.items())
+    if scale > maxScale:
+        raise ValidationError(f'There are not enough short names for a database {scale} times as big, the scale must be at most {maxScale}.')
+    newShortNames: dict[str, Iterator[str]] = {kind: iter(unused) for kind, unused in unusedShortNames.items()}
+    nationIndex = {str(option).lower(): i for i, nation in enumerate(data['nations']) for option in [i + 1, nation['shortName']] + nation['names']}
+    suffixName: Callable[[str, str], str] = lambda name, suffix: name[:MAX_NAME_LENGTH - len(suffix)] + suffix
+    nationCopies = [data['nations']]
+    namesCopies = [data['names']]
+    leagues = [league | {'nation': data['nations'][nationIndex[str(league['nation'])]]['shortName']} if str(league['nation']).isdigit() else league for league in data['leagues']]
+    for copy in range(2, scale + 1):
+        suffix = f' {copy}'
+        nationShortNames = [next(newShortNames['nations']) for _ in data['nations']]
+        nationCopies.append([nation | {'shortName': shortName, 'names': [suffixName(name, suffix) for name in nation['names']]} for nation, shortName in zip(data['nations'], nationShortNames)])
+        namesCopies.append([{'firstNames': list(nationNames['firstNames']), 'lastNames': list(nationNames['lastNames'])} for nationNames in data['names']])
+        for league in data['leagues']:
+            clubs = []
+            for club in league['clubs']:
+                rating = club['rating'] if str(club['rating'])[-1] == '!' else round(float(np.clip(club['rating'] + rng.normal(0, 2), MIN_CLUB_RATING, MAX_CLUB_RATING)), 1)
+                clubs.append(club | {'rating': rating, 'shortName': next(newShortNames['clubs']), 'fullName': club['fullName'] + suffix, 'names': [suffixName(name, suffix) for name in club['names']], 'nickname': suffixName(club['nickname'], suffix), 'colors': list(club['colors'])})
+            leagues.append(league | {'name': league['name'] + suffix, 'nation': nationShortNames[nationIndex[str(league['nation']).lower()]], 'clubs': clubs})
+    nations = [nation for copies in zip(*nationCopies) for nation in copies]
+    names = [nationNames for copies in zip(*namesCopies) for nationNames in copies]
+    makedirs(directory, exist_ok = True)
+    for name, filePath in dbFiles.items():
+        newFilePath = directory.rstrip('/\\') + SLASH + basename(filePath)
+        if name in data:
+            with open(newFilePath, 'wb') as f:
+                f.write(bytes(headers[name], 'utf8') + b'\n' + dataToYAML({'nations': nations, 'names': names, 'leagues': leagues}[name]))
+        else:
+            copyfile(filePath, newFilePath)
+
+def parseDatabase(pathsToCheck: list[str], steps: list[LoadStep]) -> dict[str, Any]:
+    '''
+    Checks that all paths in `pathsToCheck` exist and runs each step in `steps` (see `runLoadSteps()`).\n
+    Returns a dictionary containing the output of every step by its name.
     '''
-    def checkPaths(progressBars: bool = True) -> list:
-        toReturn = []
-        for pathToCheck in pathsToCheck:
-            if not exists(pathToCheck):
-                errorList.append(f'{"Directory" if pathToCheck[-1] == SLASH else "File"} "{pathToCheck}" doesn\'t exist.')
-            if progressBars:
-                bar.update(task, advance = 1)
-        for file, func, value in zip(files.values(), funcsToCheck, progressValues):
-            if exists(file):
-                try:
-                    output = func(progressBars, bar if progressBars else None, task if progressBars else None, value if progressBars else 0)
-                    if file in outputsToReturn:
-                        toReturn.append(output)
-                except (DatabaseError, ValidationError, SaveLoadError, ValueError, TypeError, KeyError, IndexError, AttributeError, OSError, YAMLError) as e:
-                    exc = str(e)
-                    try:
-                        if DEV_MODE or settings.excTraceback:
-                            exc = '\n' + format_exc()
-                    except (NameError, AttributeError):
-                        pass
-                    errorList.append(f'{type(e).__name__} in {file}: {exc}')
-        if progressBars:
-            bar.update(task, advance=100)
-        return toReturn
     errorList = []
     if progressBarSetting():
         with Progress() as bar:
-            task = bar.add_task('[green]Checking database data...', total = len(pathsToCheck) + sum(progressValues))
-            toReturn = checkPaths()
+            task = bar.add_task('[green]Checking database data...', total = len(pathsToCheck) + sum([step.progressValue for step in steps]))
+            toReturn = runLoadSteps(pathsToCheck, steps, errorList, bar = bar, task = task)
     else:
-        toReturn = checkPaths(False)
-    sleep(1)
+        toReturn = runLoadSteps(pathsToCheck, steps, errorList)
     if errorList:
-        clear()
-        origPrint(f'The database is corrupted.\nIf you moved or edited any files from the game directory, please revert the changes or reinstall the game in case you can\'t.\n\nThe following error{"s" if len(errorList) > 1 else ""} occured:')
-        for i, error in enumerate(errorList, 1):
-            origPrint(f'{i}. {error}')
-        raiseFatalError()
+        reportDatabaseErrors(errorList)
     return toReturn
 
-def genPlayer(domesticPercent, i, clubRating, leagueNation):
-    positionProbs = {pos: 1 for pos in Position.instances}
-    pos = choices(list(positionProbs.keys()), list(positionProbs.values()))[0]
-    positionProbs[pos] /= 4
-    rating = Calc.playerRating(clubRating, i)
-    age = MIN_PLAYER_AGE - 1
-    while age < MIN_PLAYER_AGE:
-        age = Calc.playerAge(i)
-    potential = Calc.playerPrimaryPotential(rating, age, i)
-    weights = [Calc.nationSelectionWeight(n.fifaRanking) for n in Nation.instances]
-    # print(sum(weights[:10]) / sum(weights), sum(weights[:50]) / sum(weights), sum(weights[:100]) / sum(weights))
-    nation: Nation = leagueNation if random() < domesticPercent else choices(Nation.instances, weights)[0]
-    return Player(
-        nation=nation,
-        rating=rating,
-        potential=potential,
-        position=pos,
-        age=age,
-        squad='first team',
-    )
-
-def createLeagues(progress: bool = False, bar: Progress | None = None, task: TaskID | None = None, value: int | float = 0) -> None:
+def runLoadSteps(pathsToCheck: list[str], steps: list[LoadStep], errorList: list[str], finished: dict[str, Any] | None = None, bar: Progress | BackgroundLoader | None = None, task: TaskID | None = None) -> dict[str, Any]:
+    '''
+    Checks that all paths in `pathsToCheck` exist and runs each step in `steps`. Errors are added to `errorList`.\n
+    The files of all steps are loaded concurrently (see `preloadFiles()`), and each step runs as soon as its files are loaded
+    and all steps it depends on are finished. Steps that depend on a failed step are skipped.
+    Steps in `finished` count as finished already.\n
+    If `bar` is not None, updates its `task` as the steps go.\n
+    Returns a dictionary containing the output of every step that was run by its name.
+    '''
+    progressBars = bar is not None
+    toReturn = {}
+    finished = finished or {}
+    for pathToCheck in pathsToCheck:
+        if not exists(pathToCheck):
+            errorList.append(f'{"Directory" if pathToCheck[-1] == SLASH else "File"} "{pathToCheck}" doesn\'t exist.')
+        if progressBars:
+            bar.update(task, advance = 1)
+    pending = [step for step in steps if all(exists(filePath) for filePath in step.filePaths)]
+    failed = {step.name for step in steps if not step in pending}
+    preloadFiles([filePath for step in pending for filePath in step.filePaths], bar)
+    while pending:
+        skipped = [step for step in pending if any(dependency in failed for dependency in step.dependencies)]
+        if skipped:
+            failed.update([step.name for step in skipped])
+            pending = [step for step in pending if not step in skipped]
+            continue
+        ready = [step for step in pending if step.isReady(finished | toReturn)]
+        if not ready:
+            waitingFor = [preloadedData[filePath] for step in pending for filePath in step.filePaths if filePath in preloadedData and not preloadedData[filePath].done()]
+            if not waitingFor:
+                errorList.append(f'Steps {", ".join([step.name for step in pending])} depend on each other.')
+                break
+            wait(waitingFor, return_when = FIRST_COMPLETED)
+            continue
+        step = ready[0]
+        pending.remove(step)
+        try:
+            toReturn[step.name] = step.func(progressBars, bar, task, step.progressValue if progressBars else 0)
+        except (DatabaseError, ValidationError, SaveLoadError, ValueError, TypeError, KeyError, IndexError, AttributeError, OSError, YAMLError) as e:
+            failed.add(step.name)
+            exc = str(e)
+            try:
+                if DEV_MODE or settings.excTraceback:
+                    exc = '\n' + format_exc()
+            except (NameError, AttributeError):
+                pass
+            errorList.append(f'{type(e).__name__} in {", ".join(step.filePaths)}: {exc}')
+    preloadedData.clear()
+    if progressBars:
+        bar.update(task, advance=100)
+    return toReturn
+
+def reportDatabaseErrors(errorList: list[str]) -> None:
+    '''Prints the errors found while loading the database and exits.'''
+    clear()
+    origPrint(f'The database is corrupted.\nIf you moved or edited any files from the game directory, please revert the changes or reinstall the game in case you can\'t.\n\nThe following error{"s" if len(errorList) > 1 else ""} occured:')
+    for i, error in enumerate(errorList, 1):
+        origPrint(f'{i}. {error}')
+    raiseFatalError()
+
+def genPlayerRecords(clubRatings: np.ndarray, i: np.ndarray, domesticPercents: np.ndarray, homeNations: np.ndarray, rng: Generator, squad: str = 'first team') -> list[tuple]:
+    '''
+    Generates the record (see `Player.toRecord()`) of a player for every element of the given arrays at once using the vectorized formulas from Calc.\n
+    Every step is done for all players in a few array operations.
+    Only returns records, so it can run in another process (see `genWorldRecords()`).\n
+    Arguments:
+    - `clubRatings`: The rating of the club of every player.
+    - `i`: The index of every player in their squad.
+    - `domesticPercents`: The chance of every player to be from their home nation.
+    - `homeNations`: The index of the home nation of every player in `Nation.instances`.
+    - `rng`: The generator to draw from (see `Streams`).
+    - `squad`: The squad that all players are in.
+    '''
+    n = len(i)
+    weightings = np.array([position.weightings for position in Position.instances])
+    modifiers = np.array([position.modifier for position in Position.instances])
+    setPieceKoes = np.array([position.setPieceKoe for position in Position.instances])
+    positions = Position.sampler.drawIndices(n, rng)
+    ratings = Calc.playerRatings(clubRatings, i, rng)
+    ages = Calc.playerAges(i, rng)
+    potentials = Calc.playerPrimaryPotentials(ratings, ages, i, rng)
+    nations = np.where(rng.random(n) < domesticPercents, homeNations, Nation.sampler.drawIndices(n, rng))
+
+    frameColumns = np.array([frames.positionIndices[position.ucShortName] for position in Position.instances])
+    playerFrames = frames.sampleMany(ratings, frameColumns[positions], rng)
+    attributes = Calc.attributeValuesFromFrames(ratings, playerFrames, rng)
+    leftFeet = Calc.playerLeftFeet(n, rng)
+
+    categories = np.column_stack([(attributes[:, 5] + attributes[:, 0]) / 2, attributes[:, 1], (attributes[:, 2] + attributes[:, 3]) / 2, attributes[:, 4]])
+    categoryWeightings = Calc.playerCategoryWeight(categories)
+    categoryWeightings = categoryWeightings / categoryWeightings.sum(1, keepdims = True) * (1 - setPieceKoes[positions, None])
+    traits = Calc.generateTraits(np.column_stack([categoryWeightings, setPieceKoes[positions]]), Calc.traitNums(n, rng), rng)
+
+    weakFoot = traits[:, Trait.find('Weak Foot', True).ucNum - 1]
+    leftFootValues = np.where(leftFeet | weakFoot, MAX_ATTRIBUTE_VALUE, 1)
+    rightFootValues = np.where(~leftFeet | weakFoot, MAX_ATTRIBUTE_VALUE, 1)
+    scores = np.minimum(MAX_ATTRIBUTE_VALUE, attributes @ weightings[:, :6].T + leftFootValues[:, None] * weightings[:, 6] + rightFootValues[:, None] * weightings[:, 7] + modifiers)
+    suits = Calc.suitValues(scores[np.arange(n), positions][:, None], scores, rng)
+    suits -= suits.max(1, keepdims = True)
+    bestPositions = suits.argmax(1)
+    potentials = np.minimum(MAX_ATTRIBUTE_VALUE, np.maximum(scores[np.arange(n), bestPositions] + suits[np.arange(n), bestPositions], potentials))
+
+    records = []
+    nameRows = rng.random((n, 2)).tolist()
+    for nationI, playerAttributes, leftFoot, playerTraits, suit, potential, age, (firstRow, lastRow) in zip(nations.tolist(), attributes.tolist(), leftFeet.tolist(), traits.tolist(), suits.tolist(), potentials.tolist(), ages.tolist(), nameRows):
+        nation = Nation.instances[nationI]
+        ucShirtName = nation.lastNames[int(lastRow * len(nation.lastNames))]
+        records.append((nation.fifaRanking, playerAttributes, 'left' if leftFoot else 'right', [traitI + 1 for traitI, hasTrait in enumerate(playerTraits) if hasTrait], suit, potential, age, squad, f'{nation.firstNames[int(firstRow * len(nation.firstNames))]} {ucShirtName}', ucShirtName))
+    return records
+
+def genSquadRecords(leagueI: int, clubI: int, clubRating: float, leagueNationI: int) -> tuple[list[tuple], int | None]:
+    '''
+    Generates the records of the senior squad of the `clubI`th club of the `leagueI`th league at once (see `genPlayerRecords()`), drawing from the club's stream (see `Streams`).\n
+    Returns the records and the index of the player that leaves the club as a free agent among the players sorted by rating without the best 11, or None if no one leaves.
+    '''
+    rng = Streams.stream('club', leagueI, clubI)
+    playerCount = int(rng.integers(MIN_SQUAD_SIZE, MAX_SQUAD_SIZE + 1))
+    i = np.arange(playerCount) * 40 / (playerCount - 1)
+    records = genPlayerRecords(np.full(playerCount, float(clubRating)), i, np.full(playerCount, Calc.clubDomesticPercent(clubRating)), np.full(playerCount, leagueNationI), rng)
+    return records, int(rng.integers(playerCount - 11)) if rng.random() < FREE_AGENT_CHANCE else None
+
+def genNationalPoolRecords(nationI: int) -> list[tuple]:
+    '''
+    Generates the records of the pool of free agents of the nation with the index `nationI` in `Nation.instances` (see `genPlayerRecords()`), drawing from the nation's stream (see `Streams`).
+    They are the players national teams are picked from in weak nations.
+    '''
+    rng = Streams.stream('nation', nationI)
+    playerCount = int(rng.integers(int(NATION_SQUAD_SIZE * 1.2), int(NATION_SQUAD_SIZE * 1.5) + 1))
+    nationIs = np.full(playerCount, nationI)
+    return genPlayerRecords(Calc.freeAgentRatings(nationIs, rng), np.arange(playerCount, dtype=float), np.ones(playerCount), nationIs, rng)
+
+def genLeagueRecords(leagueI: int, clubRatings: list[float], leagueNationI: int) -> list[tuple[list[tuple], int | None]]:
+    '''Generates the squad records of every club of the `leagueI`th league (see `genSquadRecords()`). This is the job of a world generation process.'''
+    return [genSquadRecords(leagueI, clubI, clubRating, leagueNationI) for clubI, clubRating in enumerate(clubRatings)]
+
+def genNationalPoolsRecords(nationIs: range) -> list[list[tuple]]:
+    '''Generates the records of the national pools of every nation in `nationIs` (see `genNationalPoolRecords()`). This is the job of a world generation process.'''
+    return [genNationalPoolRecords(nationI) for nationI in nationIs]
+
+def initGenerationWorker(seed: int, database: str) -> None:
+    '''
+    Prepares a world generation process (see `genWorldRecords()`).\n
+    The process does not share the objects of the game (see `processContext()`), so it loads positions, traits, nations and frames from the `database` directory.
+    '''
+    global frames
+    setDatabaseDirectory(database)
+    createPositions()
+    createTraits()
+    createNations()
+    frames = FrameStore.load(files['frames'])
+    Streams.reset(seed)
+
+def generationWorkers() -> int:
+    '''Returns the number of processes to generate a world in: 1 if parallel world generation is turned off in the settings, the number of CPUs otherwise.'''
+    try:
+        parallel = str(settings.parallelGeneration) == 'Yes'
+    except (NameError, AttributeError):
+        parallel = True
+    return (cpuCount() or 1) if parallel else 1
+
+def lazyGeneration() -> bool:
+    '''Returns True if new worlds are generated lazily (see `createLeagues()`), which is turned on in the settings.'''
+    try:
+        return str(settings.lazyGeneration) == 'Yes'
+    except (NameError, AttributeError):
+        return False
+
+def genPendingSquads() -> None:
+    '''
+    Generates everything that is left of a lazy world (see `createLeagues()`): the squads of the clubs nobody looked at yet, the national pools and the national teams.\n
+    Called when something needs every player, like player rankings, search, national teams and free agents. Does nothing if there is no lazy world.
+    '''
+    global lazyWorld
+    if not lazyWorld:
+        return
+    lazyWorld = False
+    freeAgents.squadJob = None
+    for nation in Nation.instances:
+        nation.team.squadJob = None
+    for club in Club.instances:
+        club.genSquad()
+    for nationI in range(len(Nation.instances)):
+        for freeAgent in map(Player.fromRecord, genNationalPoolRecords(nationI)):
+            freeAgents.roster.append(freeAgent)
+            freeAgent.club: Club = freeAgents
+    for nation in Nation.instances:
+        nation.pickTeam()
+
+def genWorldRecords(leagueJobs: list[tuple[int, list[float], int]], workers: int) -> tuple[list[list[tuple[list[tuple], int | None]]], list[list[tuple]]]:
+    '''
+    Generates the records of all players of a new world from `Streams.seed`.\n
+    `leagueJobs` has the arguments of `genLeagueRecords()` for every league. If `workers` is more than 1, the leagues and the nations are sharded across a pool of that many processes.
+    The streams make the records the same no matter how they are sharded, so generation falls back to this process if the pool can't be started or breaks.\n
+    Returns the squad records of every league (see `genLeagueRecords()`) and the national pool records of every nation in `Nation.instances`.
+    '''
+    shardSize = -(-len(Nation.instances) // max(1, workers))
+    nationShards = [range(start, min(start + shardSize, len(Nation.instances))) for start in range(0, len(Nation.instances), shardSize)]
+    if workers > 1:
+        try:
+            with ProcessPoolExecutor(workers, mp_context = processContext(), initializer = initGenerationWorker, initargs = (Streams.seed, dirs['db'])) as pool:
+                leagueRecords = pool.map(genLeagueRecords, *zip(*leagueJobs))
+                poolRecords = pool.map(genNationalPoolsRecords, nationShards)
+                return list(leagueRecords), [records for shard in poolRecords for records in shard]
+        except (OSError, NotImplementedError, ValueError, BrokenProcessPool):
+            pass
+    return [genLeagueRecords(*job) for job in leagueJobs], [records for shard in nationShards for records in genNationalPoolsRecords(shard)]
+
+def createLeagues(progress: bool = False, bar: Progress | None = None, task: TaskID | None = None, value: int | float = 0, newWorld: bool = False, workers: int | None = None, lazy: bool | None = None, seed: int | None = None, save: bool = True) -> None:
     '''
     Creates all League and Club objects from `files['leagues']`.
     Generates all Player objects using `files['frames']` and `files['names']` as well.\n
+    The players are restored from the saved world instead of being generated if it is valid (see `loadWorld()`) and `newWorld` is False.
+    A newly generated world is saved if `save` is True.
+    It is generated from `seed`, or the one `worldSeed()` returns if it is None, in `workers` processes, or as many as `generationWorkers()` returns if it is None (see `genWorldRecords()`).\n
+    If `lazy` is True, or it is None and lazy world generation is turned on in the settings, a new lazy world is made instead, which is neither restored nor saved.
+    The squad of every club of a lazy world is generated from the club's stream when it is first needed (see `Club.squadJob`),
+    and the rest of the world when something needs every player (see `genPendingSquads()`).\n
     If `progress` is True, updates `bar`'s `task` smoothly until all settings are created.
     The amount the bar will move by is determined by `value`.
     '''
+    global freeAgents, lazyWorld
+    lazyWorld = False
+    freeAgents = Club(0, 'Free agents', ['Free agents'], 'Free agents', '\u2500' * 3, ['ublack', 'uwhite'])
     Player.instances = []
+    rankings.reset()
+    RankingScreens.invalidate()
     Club.instances = []
+    Club.academySamplers = {}
     League.instances = []
-    global freeAgents
-    freeAgents = Club(0, 'Free agents', ['Free agents'], 'Free agents', '\u2500' * 3, ['ublack', 'uwhite'])
     freeAgents.players: list[Player] = []
-    Nation(['Free agents'], '\u2500' * 3, 'free agent', 'ublack', -1, [], [])
-    League('Friendly', Nation.instances.pop(), [freeAgents])
-    Nation.N -= 1
-    League.instances.pop()
+    League('Friendly', Nation(['Free agents'], '\u2500' * 3, 'free agent', 'ublack', -1, [], [], register = False), [freeAgents], register = False)
     global frames
-    frames = loadData(files['frames'])
+    frames = FrameStore.load(files['frames'])
     leaguesData = loadData(files['leagues'], modifyComments = True)
+    lazy = lazyGeneration() if lazy is None else lazy
+    world = None if newWorld or lazy else loadWorld()
+    if not world:
+        Streams.reset(worldSeed() if seed is None else seed)
     if progress:
         bar.update(task, advance=value / 2)
     for leagueData in leaguesData:
@@ -380,28 +851,33 @@ def createLeagues(progress: bool = False, bar: Progress | None = None, task: Tas
             if len(clubData['shortName']) != CLUB_SHORT_NAME_LENGTH:
                 raise DatabaseError(f'Length of club short names must be {CLUB_SHORT_NAME_LENGTH}, while {clubData["shortName"]}\'s is {len(clubData["shortName"])}.')
             leagueClubs.append(Club(clubData['rating'], clubData['fullName'], clubData['names'], clubData['nickname'], clubData['shortName'], clubData['colors']))
-            club = leagueClubs[-1]
-            domesticPercent = Calc.clubDomesticPercent(clubData['rating'])
-            playerCount = randint(MIN_SQUAD_SIZE, MAX_SQUAD_SIZE)
-            for i in range(playerCount):
-                i *= 40 / (playerCount - 1)
-                club.players.append(genPlayer(domesticPercent, i, clubData['rating'], leagueData['nation']))
-                club.players[-1].club: Club = club
-            if random() < FREE_AGENT_CHANCE:
-                freeAgent: Player = choice(sorted(club.players, key=lambda x: x.rating, reverse=True)[11:])
-                freeAgent.club.players.remove(freeAgent)
-                freeAgent.club: Club = freeAgents
-                freeAgents.players.append(freeAgent)
-                freeAgents.nation.players.append(freeAgent)
         League(leagueData['name'], leagueData['nation'], leagueClubs)
         if progress:
             bar.update(task, advance= value / len(leaguesData))
-    for j, nation in enumerate(Nation.instances):
-        for i in range(randint(int(NATION_SQUAD_SIZE * 1.2), int(NATION_SQUAD_SIZE * 1.5))):
-            freeAgents.players.append(genPlayer(1, i, Calc.freeAgentRating(j), nation))
-            freeAgents.players[-1].club: Club = freeAgents
+    if world:
+        Streams.reset(world.get('seed'))
+        restoreWorld(world)
+    elif lazy:
+        lazyWorld = True
+        for leagueI, league in enumerate(League.instances):
+            for clubI, club in enumerate(league.clubs):
+                club.squadJob = lambda club = club, job = (leagueI, clubI, club.origRating, league.nation.fifaRanking - 1): club.setSquad(*genSquadRecords(*job))
+        freeAgents.squadJob = genPendingSquads
+    else:
+        leagueRecords, poolRecords = genWorldRecords([(leagueI, [club.origRating for club in league.clubs], league.nation.fifaRanking - 1) for leagueI, league in enumerate(League.instances)], generationWorkers() if workers is None else workers)
+        for league, clubRecords in zip(League.instances, leagueRecords):
+            for club, (records, freeAgentI) in zip(league.clubs, clubRecords):
+                club.setSquad(records, freeAgentI)
+        for records in poolRecords:
+            for freeAgent in map(Player.fromRecord, records):
+                freeAgents.players.append(freeAgent)
+                freeAgent.club: Club = freeAgents
+    for nation in Nation.instances:
         nation.team.league = freeAgents.league
-        nation.pickTeam()
+        if lazyWorld:
+            nation.team.squadJob = genPendingSquads
+        else:
+            nation.pickTeam()
 
     clubShortNames = [club.ucShortName for club in Club.instances]
     seenShortNames = set()
@@ -413,6 +889,8 @@ def createLeagues(progress: bool = False, bar: Progress | None = None, task: Tas
             seenShortNames.add(x)
     if duplicateShortNames:
         raise DatabaseError(f'There {"are" if len(duplicateShortNames) > 1 else "is a"} duplicate club short name{"s" if len(duplicateShortNames) > 1 else ""}: {", ".join(duplicateShortNames)}.')
+    if save and not (world or lazyWorld):
+        saveWorld()
 
 def createPositions(progress: bool = False, bar: Progress | None = None, task: TaskID | None = None, value: int | float = 0) -> None:
     '''
@@ -428,6 +906,7 @@ def createPositions(progress: bool = False, bar: Progress | None = None, task: T
         Position(position['shortName'], position['name'], position['color'], list(position['weightings'].values()), position['setPieceKoe'], position['modifier'])
         if progress:
             bar.update(task, advance=value / len(positions))
+    Position.sampler = WeightedSampler(Position.instances, [1] * len(Position.instances))
 
 def createNations(progress: bool = False, bar: Progress | None = None, task: TaskID | None = None, value: int | float = 0) -> None:
     '''
@@ -436,6 +915,7 @@ def createNations(progress: bool = False, bar: Progress | None = None, task: Tas
     The amount the bar will move by is determined by `value`.
     '''
     Nation.instances = []
+    Nation.N = 0
     nations = loadData(files['nations'])
     names = loadData(files['names'])
     if progress:
@@ -448,6 +928,7 @@ def createNations(progress: bool = False, bar: Progress | None = None, task: Tas
         Nation(nation['names'], nation['shortName'], nation['nationality'], nation['color'], i, names['firstNames'], names['lastNames'])
         if progress:
             bar.update(task, advance=value / len(nations) / 2)
+    Nation.sampler = WeightedSampler(Nation.instances, [Calc.nationSelectionWeight(nation.fifaRanking) for nation in Nation.instances])
 
     nationShortNames = [nation.ucShortName for nation in Nation.instances]
     seenShortNames = set()
@@ -482,6 +963,8 @@ def createTraits(progress: bool = False, bar: Progress | None = None, task: Task
     Trait.categories = list(set((trait.ucCategory for trait in Trait.instances)))
     if set(Trait.categories) != {'Physical', 'Attacking', 'Technical', 'Defensive', 'Set Piece'}:
         raise DatabaseError(f"Trait category set {set(Trait.categories)} is not equal to {{'Physical', 'Attacking', 'Technical', 'Defensive', 'Set Piece'}}.")
+    Trait.bits = {searchOption: trait.bit for trait in Trait.instances for searchOption in trait.searchOptions}
+    Trait.categoryMasks = {category: Trait.maskOf(trait for trait in Trait.instances if trait.ucCategory == category) for category in Trait.categories}
 
 def createStyle(progress: bool = False, bar: Progress | None = None, task: TaskID | None = None, value: int | float = 0) -> dict[str, str]:
     '''
@@ -503,6 +986,29 @@ def createStyle(progress: bool = False, bar: Progress | None = None, task: TaskI
         styleDict[f'bg{code}'] = f'bg:{color}'
     return styleDict
 
+def writeSetup(hero: Hero, filePath: str) -> None:
+    '''Saves the `hero` to `filePath` with a hash of the setup, so that changes to the file can be detected by `readSetup()`. Raises a SaveLoadError if saving fails.'''
+    heroPrep = {
+        'hero': hero.toDict(),
+        'time': getTime()
+    }
+    heroPrep['hash'] = dataToHash(heroPrep)
+    saveData(filePath, heroPrep, True)
+
+def readSetup(filePath: str) -> Hero:
+    '''Loads a hero setup saved with `writeSetup()` from `filePath`, creates a Hero object and returns it. Raises a ValidationError if the file was modified.'''
+    decodedHeroPrep = loadData(filePath)
+    decodedHash = decodedHeroPrep.pop('hash')
+    hashFlag = decodedHash != dataToHash(decodedHeroPrep)
+    timeFlag = not isValidChangeDate(filePath, decodedHeroPrep['time'])
+    if hashFlag and timeFlag:
+        raise ValidationError('B001')
+    if hashFlag:
+        raise ValidationError('H001')
+    if timeFlag:
+        raise ValidationError('T001')
+    return Hero(decodedHeroPrep['hero'])
+
 def saveSetup(hero: Hero) -> None:
     '''Saves the `hero` to a file.'''
     while True:
@@ -519,12 +1025,7 @@ def saveSetup(hero: Hero) -> None:
             if not yesNoMenu(f'There is already a setup called {removeExtension(filePath)}. Do you want to replace it with this one?'):
                 continue
         try:
-            heroPrep = {
-                'hero': hero.toDict(),
-                'time': getTime()
-            }
-            heroPrep['hash'] = dataToHash(heroPrep)
-            saveData(dirs['setups'] + filePath, heroPrep, True)
+            writeSetup(hero, dirs['setups'] + filePath)
         except Exception as e:
             print('<ured>An error occured while trying to save your setup:</ured>', end=' ')
             origPrint(e)
@@ -545,21 +1046,11 @@ def loadSetup() -> Hero:
             break
         filePath = dirs['setups'] + setupFiles[setupNumber - 1]
         try:
-            decodedHeroPrep = loadData(filePath)
-            decodedHash = decodedHeroPrep.pop('hash')
             try:
-                hashFlag = decodedHash != dataToHash(decodedHeroPrep)
-                timeFlag = not isValidChangeDate(filePath, decodedHeroPrep['time'])
-                if hashFlag and timeFlag:
-                    raise ValidationError('B001')
-                if hashFlag:
-                    raise ValidationError('H001')
-                if timeFlag:
-                    raise ValidationError('T001')
+                hero = readSetup(filePath)
             except ValidationError as e:
                 input(f'<ured>This setup was modified.\nPress Enter to continue:</ured> ')
                 continue
-            hero = Hero(decodedHeroPrep['hero'])
             hero.club.players.append(hero)
             print('<dgreen>Your setup was successfully loaded!</dgreen>')
             sleep(1)
@@ -590,6 +1081,14 @@ def notReadyWarning() -> None:
     print('<dyellow>This feature is temporarily unavailable and will be coming in a future update.\nStay tuned!\n</dyellow>')
     input('<uyellow>Press Enter to continue.</uyellow> ')
 
+def waitForWorld() -> None:
+    '''Waits until the world that is loaded in the background is ready (see `BackgroundLoader`). Does nothing if it isn't loaded in the background.'''
+    try:
+        loader: BackgroundLoader = worldLoader
+    except NameError:
+        return
+    loader.wait()
+
 def raiseFatalError() -> None:
     '''Exits the application after an error.'''
     origInput('\nPress Enter to terminate the application. ')
@@ -614,6 +1113,7 @@ def startingMenu() -> str:
     - 'load-game'
     - 'rankings'
     - 'settings'
+    - 'new-world'
     - 'quit'
     '''
     clear()
@@ -621,6 +1121,7 @@ def startingMenu() -> str:
         MenuOption('Create your first hero!', 'ugreen', 'Let\'s start your first game! Your hero is destined for success.', 'new-hero'),
         MenuOption('View rankings', 'uyellow', 'View worldwide rankings of football leagues, clubs, etc.', 'rankings'),
         MenuOption('Go to settings', 'uwhite', 'Customise your game.', 'settings'),
+        MenuOption('Generate a new world', 'gcyan', 'Replace every player in the game with newly generated ones.\nLeagues, clubs and nations will stay the same.', 'new-world'),
         MenuOption('Quit', 'dred', 'Quit the game.\nBut you won\'t pick this, right?', 'quit')
     ]
     if saveFiles:
@@ -640,6 +1141,7 @@ def rankingsMenu() -> str:
     - 'leagues'
     - 'clubs'
     - 'players'
+    - 'search'
     - 'quit'
     '''
     clear()
@@ -648,6 +1150,7 @@ def rankingsMenu() -> str:
         MenuOption('Leagues', 'cgreen', 'View worldwide rankings of every league in the game based on the rating of their clubs.', 'leagues'),
         MenuOption('Clubs', 'gcyan', 'View worldwide rankings of every club in the game based on their rating.', 'clubs'),
         MenuOption('Players', 'ucyan', 'View worldwide rankings of every player in the game based on their rating or potential.', 'players'),
+        MenuOption('Search', 'uyellow', 'Find a player, club, league or nation by name.', 'search'),
         MenuOption('Quit', 'dred', 'Quit to the main menu.', 'quit'),
     ]
     toReturn = menu('Which rankings do you want to view?', options, default='quit')
@@ -714,7 +1217,7 @@ def academyMenu(hero: dict[str, Any]) -> Club:
     '''
     offersFrom: list[Club] = []
     while len(offersFrom) < 2:
-        offersFrom = list(set(choices(Club.instances, [Calc.academyOfferClubWeight(i, club.nation is hero['nation']) for i, club in enumerate(Club.instances)], k=Calc.academyOfferCount())))
+        offersFrom = list(set(Club.academySampler(hero['nation']).drawMany(Calc.academyOfferCount())))
     options: list[MenuOption] = [MenuOption(club.ucName, club.colors[0], f'{club.ucName} want {hero['fullName']} to join their academy.\nTheir senior team plays in the {club.league.ucName} which is {club.nation.ucName}\'s {"top flight" if club.league.level == 1 else f"{ordinal(club.league.level)} division"}.', club) for club in offersFrom] + [MenuOption('Reject all offers', 'dred', 'Reject all offers and stay without a club.', freeAgents)]
     try:
         while True:
@@ -737,6 +1240,10 @@ def academyMenu(hero: dict[str, Any]) -> Club:
 
 def viewNationRankings(mode: str = 'fifa-ranking') -> None:
     '''Prints worldwide nation rankings.'''
+    RankingScreens.get('nations', mode).input()
+
+def nationRankingsTable(mode: str = 'fifa-ranking') -> Table:
+    '''Returns the table of worldwide nation rankings.'''
     sortFunc: Callable[[Player], float]
     match mode:
         case 'fifa-ranking': sortFunc = lambda x: -x.fifaRanking
@@ -745,36 +1252,80 @@ def viewNationRankings(mode: str = 'fifa-ranking') -> None:
     tableHeaders = ([] if mode == 'fifa-ranking' else ['№']) + ['FIF', 'ShN', Header('Rating', columnAlign = 'center'), 'Nation', 'Best league', 'Best club', 'Star player']
     tableRows = []
     for i, nation in enumerate(sorted(Nation.instances, key=sortFunc, reverse=True), 1):
-        starPlayer: Player = sorted(nation.players, key=lambda x: x.rating, reverse=True)[0]
+        starPlayer: Player = rankings.top(1, 'rating', 'nation', nation)[0]
         tableRows.append(([] if mode == 'fifa-ranking' else [i]) + [nation.fifaRanking, nation.shortName, str(round(nation.rating, 2)).ljust(5, '0'), nation.name, nation.leagues[0].name if nation.leagues else f'!fill {LINE}', nation.leagues[0].sortedClubs[0].name if nation.leagues else f'!fill {LINE}', f'{starPlayer.fullName} ({starPlayer.irating})'])
-    Table(tableRows, tableHeaders, '<bold>Worldwide national team rankings:</bold>', '<uyellow>Press Enter to go back to the start menu: </uyellow>').input()
+    return Table(tableRows, tableHeaders, '<bold>Worldwide national team rankings:</bold>', '<uyellow>Press Enter to go back to the start menu: </uyellow>')
 
 def viewLeagueRankings(mode: str = 'average') -> None:
     '''Prints worldwide league rankings.'''
+    RankingScreens.get('leagues', mode).input()
+
+def leagueRankingsTable(mode: str = 'average') -> Table:
+    '''Returns the table of worldwide league rankings.'''
     tableHeaders = ['№', 'Rating', 'ShoN', 'League', 'Best clubs']
     tableRows = []
     for i, league in enumerate(sorted(League.instances, key = lambda x: x.getRating(mode), reverse=True), 1):
         tableRows.append([i, str(league.getRating(mode)).ljust(5, '0'), league.shortName, league.name, ', '.join([club.name for club in league.sortedClubs[:3]])])
-    Table(tableRows, tableHeaders, '<bold>Worldwide football league rankings:</bold>', '<uyellow>Press Enter to go back to the start menu: </uyellow>').input()
-
-def viewClubRankings() -> None:
-    '''Prints worldwide club rankings.'''
+    return Table(tableRows, tableHeaders, '<bold>Worldwide football league rankings:</bold>', '<uyellow>Press Enter to go back to the start menu: </uyellow>')
+
+def viewClubRankings(league: League | None = None) -> None:
+    '''Prints worldwide club rankings, or the best players and the rankings of the clubs of `league` if it is given.'''
+    if league:
+        leaguePlayersTable(league).print()
+    (clubRankingsTable(league) if league else RankingScreens.get('clubs')).input()
+
+def leaguePlayersTable(league: League, k: int = 10) -> Table:
+    '''Returns the table of the best `k` players of `league` with their fan descriptions.'''
+    genPendingSquads()
+    players = rankings.top(k, 'rating', 'league', league)
+    tableHeaders = ['№', 'Full name', 'Nat', 'Club', 'Pos', Header('Age', columnColor='lbrown'), Header('OVR', columnColor='uwhite'), Header('POT', columnColor='dgreen'), 'Description']
+    tableRows = [[i, p.fullName, p.nation.shortName, p.club.name, p.position.shortName, p.iage, p.irating, p.ipotential, description] for i, (p, description) in enumerate(zip(players, Player.descriptions(players)), 1)]
+    return Table(tableRows, tableHeaders, f'<bold>Best players in {league.name}:</bold>')
+
+def clubRankingsTable(league: League | None = None) -> Table:
+    '''Returns the table of worldwide club rankings, or of the clubs of `league` if it is given.'''
     tableHeaders = ['№', Header('Rating', columnAlign = 'center'), 'Leag', 'Colors', 'ShN', 'Generic name', 'Nickname']
     tableRows = []
-    for i, club in enumerate(sorted(Club.instances, key = lambda x: x.rating, reverse=True), 1):
+    for i, club in enumerate(league.sortedClubs if league else sorted(Club.instances, key = lambda x: x.rating, reverse=True), 1):
         tableRows.append([i, str(round(club.rating, 2)).ljust(5, '0'), club.league.shortName, club.colorText('   ', bg=True) + club.color2Text('   ', bg=True), club.shortName, club.name, club.nickname])
-    Table(tableRows, tableHeaders, '<bold>Worldwide football club rankings:</bold>', '<uyellow>Press Enter to go back to the start menu: </uyellow>').input()
+    return Table(tableRows, tableHeaders, f'<bold>{league.name} club rankings:</bold>' if league else '<bold>Worldwide football club rankings:</bold>', '<uyellow>Press Enter to go back to the start menu: </uyellow>')
+
+def viewSearch() -> None:
+    '''Asks the user for a name of a player, club, league or nation with autocomplete and shows the profile of the best match.'''
+    genPendingSquads()
+    search = Search()
+    while True:
+        query = input('<uyellow>Enter a name of a player, club, league or nation (type the beginning, then use arrow keys) or press Enter to go back:</uyellow> ', completer = search)
+        if not query.strip():
+            return
+        found = search.find(query)
+        if found:
+            break
+        print(f'\n<ured>Sorry, nothing was found by "{query.replace("<", LESS).replace(">", MORE)}".</ured>\n')
+    if isinstance(found[0], League):
+        viewClubRankings(found[0])
+    else:
+        found[0].viewProfile()
 
 def viewPlayerRankings(mode: str = 'rating') -> None:
     '''Prints worldwide player rankings.'''
-    sortFunc: Callable[[Player], float]
-    match mode:
-        case 'rating': sortFunc = lambda x: x.rating
-        case 'potential': sortFunc = lambda x: x.potential
-        case _: raise GameError(f'viewPlayerRankings({mode=}): mode is not "rating" or "potential".')
+    table: PagedTable = RankingScreens.get('players', mode)
+    table.page = 0
+    table.input()
+
+def playerRankingsTable(mode: str = 'rating') -> PagedTable:
+    '''Returns the paged table of worldwide player rankings. Its rows are read from `rankings` when they are shown. A lazy world is generated fully first (see `genPendingSquads()`).'''
+    if mode not in PlayerRankings.modes:
+        raise GameError(f'viewPlayerRankings({mode=}): mode is not "rating" or "potential".')
+    genPendingSquads()
     tableHeaders = ['№', 'Full name', 'Nation', 'Clb', 'Pos', Header('Pac', columnColor='uyellow'), Header('Sho', columnColor='ured'), Header('Pas', columnColor='ucyan'), Header('Dri', columnColor='umagenta'), Header('Dfn', columnColor='ugreen'), Header('Phy', columnColor='uwhite'), Header('Foot', 'left', columnColor='uorange'), Header('Age', columnColor='lbrown'), Header('OVR', columnColor='uwhite'), Header('POT', columnColor='dgreen')]
-    tableRows = [[i, p.fullName, p.nation.name, p.club.shortName, p.position.shortName, *p.iattributes, p.foot, p.iage, p.irating, p.ipotential] for i, p in enumerate(sorted(Player.instances, key=sortFunc, reverse=True)[:1000], 1)]
-    Table(tableRows, tableHeaders, '<bold>Top 1000 players in the database:</bold>', '<uyellow>Press Enter to go back to the start menu: </uyellow>').input()
+    def getRow(i: int) -> list[Any]:
+        p = rankings.top(1, mode, start=i)[0]
+        return [i + 1, p.fullName, p.nation.name, p.club.shortName, p.position.shortName, *p.iattributes, p.foot, p.iage, p.irating, p.ipotential]
+    players = Player.instances
+    columnLens = [len(str(len(players))), max(len(p.ucFullName) for p in players), max(len(nation.ucName) for nation in Nation.instances), max(len(club.ucShortName) for club in Club.instances + [freeAgents]), max(len(position.ucShortName) for position in Position.instances)]
+    columnLens += [len(str(MAX_ATTRIBUTE_VALUE))] * 6 + [len('right'), len(str(max(p.iage for p in players))), len(str(rankings.top(1)[0].irating)), len(str(rankings.top(1, 'potential')[0].ipotential))]
+    return PagedTable(len(players), getRow, tableHeaders, '<bold>All players in the database:</bold>', '<uyellow>Type "q" to go back to the start menu: </uyellow>', columnLens = columnLens)
 
 ### Misc functions
 
@@ -799,9 +1350,201 @@ def terminalWidth() -> int:
 def terminalHeight() -> int:
     return terminalSize()[1]
 
+def numberArgument(option: str) -> int | None:
+    '''Returns the whole number given after `option` on the command line, or None if `option` is not there. Raises a ValidationError if `option` is not followed by a whole number.'''
+    if option not in argv:
+        return None
+    value = argv[argv.index(option) + 1] if argv.index(option) + 1 < len(argv) else ''
+    if not (value.isascii() and value.isdigit()):
+        raise ValidationError(f'{option} must be followed by a whole number, not {repr(value) if value else "nothing"}.')
+    return int(value)
+
+def checkArguments() -> bool:
+    '''Returns True if every option in `NUMBER_OPTIONS` on the command line is followed by a whole number. Otherwise, prints what is wrong and `USAGE` to stderr, and returns False. The style isn't loaded yet at that point, so the text is printed without colors.'''
+    try:
+        for option in NUMBER_OPTIONS:
+            numberArgument(option)
+    except ValidationError as e:
+        origPrint(f'{e}\n{USAGE}', file = stderr)
+        return False
+    return True
+
+def requestedSeed() -> int | None:
+    '''Returns the world seed given after `--seed` on the command line or in the settings, or None if it should be random.'''
+    if '--seed' in argv:
+        return numberArgument('--seed')
+    try:
+        seed = str(settings.worldSeed)
+    except (NameError, AttributeError):
+        return None
+    return int(seed) if seed.isdigit() else None
+
+def worldSeed() -> int:
+    '''Returns the seed to generate a new world from, a random one if none was requested (see `requestedSeed()`).'''
+    seed = requestedSeed()
+    return SeedSequence().entropy if seed is None else seed
+
 def ordinal(n: int) -> str:
     return str(n) + ('th' if 11 <= n % 100 <= 13 else ['th', 'st', 'nd', 'rd', 'th'][min(n % 10, 4)])
 
+### Benchmark functions
+
+def measure(func: Callable[[], Any], repeats: int, setup: Callable[[], Any] | None = None) -> dict[str, float]:
+    '''
+    Runs `func` `repeats` times and returns the best, median and mean time of a run in seconds, their standard deviation and the number of runs.\n
+    If `setup` is not None, it is run before every run of `func` without being timed.
+    '''
+    timings: list[float] = []
+    for _ in range(repeats):
+        if setup:
+            setup()
+        before = perf_counter()
+        func()
+        timings.append(perf_counter() - before)
+    return {'best': min(timings), 'median': median(timings), 'mean': mean(timings), 'stdev': stdev(timings) if repeats > 1 else 0., 'repeats': repeats}
+
+def runBenchmarks(repeats: int = BENCHMARK_REPEATS) -> dict[str, dict[str, float]]:
+    '''
+    Measures the hot paths of the game with `measure()` and returns the statistics by the name of the case.\n
+    The cases are YAML parsing and cached loading of every database file, making nations and leagues (generating a world from `BENCHMARK_SEED` and restoring the saved one),
+    all load steps, club and league ratings (league ratings include computing the ratings of their clubs, as no rating is cached), sorting player rankings, `Table.getPrintable()` on `BENCHMARK_TABLE_ROWS` rows and saving and loading a hero setup.
+    The saved world is made first if there isn't one.
+    '''
+    results: dict[str, dict[str, float]] = {}
+    world = World()
+    world.load()
+    for name, filePath in dbFiles.items():
+        results[f'yaml {name}'] = measure(lambda filePath = filePath: readData(filePath, False), repeats)
+        results[f'load {name}'] = measure(lambda filePath = filePath: loadData(filePath), repeats)
+    results['createNations'] = measure(createNations, repeats)
+    results['createLeagues (generate)'] = measure(lambda: createLeagues(newWorld = True, workers = 1, lazy = False, seed = BENCHMARK_SEED, save = False), repeats, createNations)
+    results['createLeagues (restore)'] = measure(lambda: createLeagues(lazy = False), repeats, createNations)
+    results['parseDatabase'] = measure(lambda: runLoadSteps(list(files.values()) + list(dirs.values()), loadSteps + worldSteps, []), repeats)
+    clearRatings = lambda: [club.clearRating() for club in Club.instances] + [league.clearRatings() for league in League.instances]
+    results['Club.rating'] = measure(lambda: [club.rating for club in Club.instances], repeats, clearRatings)
+    for mode in ['average', 'top', 'median']:
+        results[f'League.getRating ({mode})'] = measure(lambda mode = mode: [league.getRating(mode) for league in League.instances], repeats, clearRatings)
+    for mode in PlayerRankings.modes:
+        results[f'player rankings ({mode})'] = measure(lambda mode = mode: rankings.top(1, mode), repeats, rankings.reset)
+    pagedTable = playerRankingsTable()
+    table = Table([pagedTable.getRow(i) for i in range(min(BENCHMARK_TABLE_ROWS, pagedTable.rowCount))], pagedTable.headers)
+    results[f'Table.getPrintable ({len(table.data)} rows)'] = measure(table.getPrintable, repeats)
+    hero = Hero({'fullName': 'Bench Marker', 'shirtName': 'Marker', 'nation': Nation.instances[0].ucName, 'pac': 50, 'sho': 50, 'pas': 50, 'dri': 50, 'dfn': 50, 'phy': 50, 'foot': 'right', 'traits': [1], 'club': Club.instances[0].ucName})
+    setupPath = CACHE_DIRECTORY + 'benchmark' + FILE_EXTENSION
+    makedirs(CACHE_DIRECTORY, exist_ok = True)
+    results['hero setup save'] = measure(lambda: writeSetup(hero, setupPath), repeats)
+    results['hero setup load'] = measure(lambda: readSetup(setupPath), repeats)
+    remove(setupPath)
+    return results
+
+def benchmarkSuite(repeats: int = BENCHMARK_REPEATS, saveBaseline: bool = False) -> list[str]:
+    '''
+    Runs all benchmarks (see `runBenchmarks()`), writes the results to `BENCHMARK_RESULTS_FILE` as JSON and prints them next to the ones in `BENCHMARK_BASELINE_FILE`.
+    If `saveBaseline` is True, the results are saved as the new baseline instead.\n
+    Returns the names of the cases whose best time is more than `BENCHMARK_TOLERANCE` slower than the baseline's.
+    '''
+    report = {'time': getTime(), 'cpus': cpuCount(), 'repeats': repeats, 'results': runBenchmarks(repeats)}
+    report['players'] = len(Player.instances)
+    try:
+        with open(BENCHMARK_BASELINE_FILE) as f:
+            baseline: dict[str, dict[str, float]] = loadJSON(f)['results']
+    except (OSError, JSONDecodeError, KeyError):
+        baseline = {}
+    tableRows = []
+    regressions = []
+    for name, result in report['results'].items():
+        change = ''
+        if name in baseline:
+            ratio = result['best'] / baseline[name]['best'] - 1
+            change = f'{ratio:+.1%}'
+            if ratio > BENCHMARK_TOLERANCE:
+                regressions.append(name)
+                change = f'<ured>{change}</ured>'
+            elif ratio < -BENCHMARK_TOLERANCE:
+                change = f'<ugreen>{change}</ugreen>'
+        tableRows.append([name, f'{result["best"] * 1000:.3f}', f'{result["median"] * 1000:.3f}', f'{result["stdev"] * 1000:.3f}', f'{baseline[name]["best"] * 1000:.3f}' if name in baseline else '', change])
+    report['regressions'] = regressions
+    for filePath in [BENCHMARK_RESULTS_FILE] + ([BENCHMARK_BASELINE_FILE] if saveBaseline else []):
+        with open(filePath, 'w') as f:
+            dumpJSON(report, f, indent = 4)
+    caption = f'Saved as the new baseline in {BENCHMARK_BASELINE_FILE}.' if saveBaseline else f'{len(regressions)} regression{"" if len(regressions) == 1 else "s"} against {BENCHMARK_BASELINE_FILE}.' if baseline else f'There is no baseline yet. Run with --save-baseline to save one.'
+    Table(tableRows, ['Case', Header('Best, ms', columnAlign = 'right'), Header('Median, ms', columnAlign = 'right'), Header('Stdev, ms', columnAlign = 'right'), Header('Baseline, ms', columnAlign = 'right'), Header('Change', columnAlign = 'right')], f'Benchmarks ({repeats} runs each, results in {BENCHMARK_RESULTS_FILE}):', caption).print()
+    return regressions
+
+def benchmarkStartup(repeats: int = 5) -> None:
+    '''
+    Prints how long it takes to load every file in `files` without a cache (cold) and with it (warm).\n
+    The cold timing is measured once after deleting the cache, the warm one is the best of `repeats` loads.
+    '''
+    tableRows = []
+    coldTotal = warmTotal = 0
+    for name, filePath in files.items():
+        clearCache([filePath])
+        before = time()
+        loadData(filePath)
+        cold = time() - before
+        warm = cold
+        for _ in range(repeats):
+            before = time()
+            loadData(filePath)
+            warm = min(warm, time() - before)
+        coldTotal += cold
+        warmTotal += warm
+        tableRows.append([name, f'{cold:.4f}', f'{warm:.4f}', f'{cold / warm:.1f}x'])
+    tableRows.append(['total', f'{coldTotal:.4f}', f'{warmTotal:.4f}', f'{coldTotal / warmTotal:.1f}x'])
+    Table(tableRows, ['File', Header('Cold, s', columnAlign = 'right'), Header('Warm, s', columnAlign = 'right'), Header('Speedup', columnAlign = 'right')], 'Database load times:').print()
+
+def benchmarkWorld(repeats: int = 3) -> None:
+    '''
+    Prints how long it takes to generate a new world (including saving it) in one process and in a process per CPU, to make a lazy world (see `createLeagues()`) and to restore the saved one.\n
+    Nations are created again before every run as `createLeagues()` adds to them. Every timing is the best of `repeats` runs.
+    '''
+    createPositions()
+    createTraits()
+    processes = cpuCount() or 1
+    options = {'generate': {'newWorld': True, 'workers': 1}} | ({f'generate ({processes} processes)': {'newWorld': True, 'workers': processes}} if processes > 1 else {}) | {'generate lazily': {'lazy': True}, 'restore': {'lazy': False}}
+    timings: dict[str, list[float]] = {mode: [] for mode in options}
+    playerCounts: dict[str, int] = {}
+    for _ in range(repeats):
+        for mode in timings:
+            createNations()
+            before = time()
+            createLeagues(**options[mode])
+            timings[mode].append(time() - before)
+            playerCounts[mode] = len(Player.instances)
+    tableRows = [[mode, f'{min(modeTimings):.4f}', f'{sum(modeTimings) / len(modeTimings):.4f}', playerCounts[mode]] for mode, modeTimings in timings.items()]
+    Table(tableRows, ['Mode', Header('Best, s', columnAlign = 'right'), Header('Average, s', columnAlign = 'right'), Header('Players', columnAlign = 'right')], 'World creation times:', f'Restoring is {min(timings["generate"]) / min(timings["restore"]):.1f}x faster than generating.').print()
+
+def benchmarkMemory() -> None:
+    '''
+    Prints how many bytes every player of the world takes, measured with tracemalloc.\n
+    The players are built twice from the same records: as Player objects and as plain objects with a `__dict__`, a `suit` dictionary and colored copies of the names,
+    which is how players were stored before they got `__slots__`.
+    '''
+    createPositions()
+    createTraits()
+    createNations()
+    createLeagues()
+    records = dumps([player.toRecord() for player in Player.instances], HIGHEST_PROTOCOL)
+
+    def legacyPlayer(record: tuple) -> SimpleNamespace:
+        nationRanking, attributes, foot, traitNums, suit, potential, age, squad, ucFullName, ucShirtName = record
+        nation = Nation.instances[nationRanking - 1]
+        player = SimpleNamespace(age = age, nation = nation, club = None, foot = foot, traits = [Trait.instances[traitNum - 1] for traitNum in traitNums], suit = dict(zip(Position.instances, suit)), potential = potential, squad = squad, ucShirtName = ucShirtName, ucFullName = ucFullName, fullName = nation.colorText(ucFullName), shirtName = nation.colorText(ucShirtName))
+        player.pac, player.sho, player.pas, player.dri, player.dfn, player.phy = attributes
+        return player
+
+    tableRows = []
+    for layout, createPlayer in [('dict', legacyPlayer), ('slots', Player.fromRecord)]:
+        collect()
+        startTracing()
+        players = [createPlayer(record) for record in loads(records)]
+        size = tracedMemory()[0]
+        stopTracing()
+        tableRows.append([layout, len(players), f'{size / 2 ** 20:.2f}', round(size / len(players))])
+        del players
+    Table(tableRows, ['Layout', Header('Players', columnAlign = 'right'), Header('Total, MiB', columnAlign = 'right'), Header('Bytes per player', columnAlign = 'right')], 'Player memory usage:', f'Players take {tableRows[0][3] / tableRows[1][3]:.1f}x less memory with __slots__.').print()
+
 ### Error classes
 
 class GameError(Exception):
@@ -827,7 +1570,45 @@ class QuitError(Exception):
 ### Placeholder classes
 
 class Find:
-    '''Placeholder for `find()`.'''
+    '''
+    Placeholder for `find()` and `findPrefix()`.\n
+    Each subclass keeps its own indexes of `searchOptions`, they are updated from `instances` when they are searched:
+    - `.searchIndex`: A dictionary of the instance for every search option. If several instances have the same option, the first one is kept.
+    - `.prefixIndex`: A sorted list of `(searchOption, number)` pairs for prefix search, `number` is the index of the instance in `instances`.
+    - `.indexedInstances`: The `instances` list the indexes were built for.
+    - `.indexedCount`: The number of instances in the indexes.
+    - `.indexedIds`: A set of `id()` of indexed instances.
+    '''
+    searchIndex: ClassVar[dict[str, Any]]
+    prefixIndex: ClassVar[list[tuple[str, int]]]
+    indexedInstances: ClassVar[list[Any] | None] = None
+    indexedCount: ClassVar[int]
+    indexedIds: ClassVar[set[int]]
+    @classmethod
+    def updateIndex(cls) -> None:
+        '''
+        Adds new instances to the indexes of `cls`. The indexes are built again if `instances` was replaced or if instances were removed from it.\n
+        A few new instances are put in their places in `.prefixIndex` one by one, while on a rebuild or when many instances were added, it is sorted once.
+        '''
+        if cls is Find:
+            raise ValidationError('updateIndex(): function called with cls=Find.')
+        instances: list[Any] = cls.instances
+        if cls.__dict__.get('indexedInstances') is not instances or cls.indexedCount > len(instances) or (cls.indexedCount and not id(instances[cls.indexedCount - 1]) in cls.indexedIds):
+            cls.searchIndex, cls.prefixIndex, cls.indexedInstances, cls.indexedCount, cls.indexedIds = {}, [], instances, 0, set()
+        newEntries: list[tuple[str, int]] = []
+        for number in range(cls.indexedCount, len(instances)):
+            obj = instances[number]
+            for searchOption in obj.searchOptions:
+                cls.searchIndex.setdefault(searchOption, obj)
+                newEntries.append((searchOption, number))
+            cls.indexedIds.add(id(obj))
+        if len(newEntries) < len(cls.prefixIndex):
+            for entry in newEntries:
+                insort(cls.prefixIndex, entry)
+        elif newEntries:
+            cls.prefixIndex = sorted(cls.prefixIndex + newEntries)
+        cls.indexedCount = len(instances)
+
     @classmethod
     def find(cls, name: Any, allowExceptions: bool = False) -> Any:
         '''
@@ -843,15 +1624,35 @@ class Find:
             return freeAgents
         if newName == 'friendly':
             return freeAgents.league
-        for obj in cls.instances:
-            if newName in obj.searchOptions or name is obj:
-                return obj
+        cls.updateIndex()
+        if id(name) in cls.indexedIds:
+            return name
+        if newName in cls.searchIndex:
+            return cls.searchIndex[newName]
         if allowExceptions:
             raise DatabaseError(f'Couldn\'t find a {cls.__name__.lower()} named "{name}".')
         return -1
 
+    @classmethod
+    def findPrefix(cls, prefix: str, limit: int | None = None) -> list[Any]:
+        '''
+        Returns instances that have a search option starting with `prefix`, at most `limit` of them.\n
+        Instances are sorted by their first matching search option and are not repeated.
+        '''
+        if cls is Find:
+            raise ValidationError('findPrefix(): function called with cls=Find.')
+        cls.updateIndex()
+        prefix = prefix.lower()
+        found: dict[int, Any] = {}
+        for searchOption, number in islice(cls.prefixIndex, bisect_left(cls.prefixIndex, (prefix,)), None):
+            if not searchOption.startswith(prefix) or len(found) == limit:
+                break
+            found.setdefault(number, cls.instances[number])
+        return list(found.values())
+
 class ColorText:
     '''Placeholder for `colorText()`.'''
+    __slots__ = ()
     def colorText(self, text: str, color: str = 'default', bg: bool = False) -> str:
         '''Colors `text` with `color` in prompt_toolkit's HTML format.'''
         if not color:
@@ -863,16 +1664,24 @@ class ColorText:
 class Calc:
     '''Class for formulas.'''
     @staticmethod
-    def playerRating(clubRating: float, i: int) -> float:
-        return clubRating - 1.2 * i ** .5 - max(0, i - 10) ** 2 / 60 + 6 * random() + 3
-        
+    def playerRatings(clubRatings: np.ndarray, i: np.ndarray, rng: Generator) -> np.ndarray:
+        '''Returns the rating of every player from the rating of their club and their index `i` in the squad.'''
+        return clubRatings - 1.2 * i ** .5 - np.maximum(0, i - 10) ** 2 / 60 + 6 * rng.random(len(i)) + 3
+
     @staticmethod
-    def playerAge(i: int) -> float:
-        return normalvariate(29 - (i + 1) ** 3 / 7200, 3.5 + i / 20)
+    def playerAges(i: np.ndarray, rng: Generator) -> np.ndarray:
+        '''Returns the age of every player from their index `i` in the squad. Ages below `MIN_PLAYER_AGE` are drawn again.'''
+        ages = np.full(len(i), MIN_PLAYER_AGE - 1.)
+        tooYoung = ages < MIN_PLAYER_AGE
+        while tooYoung.any():
+            ages[tooYoung] = rng.normal(29 - (i[tooYoung] + 1) ** 3 / 7200, 3.5 + i[tooYoung] / 20)
+            tooYoung = ages < MIN_PLAYER_AGE
+        return ages
         
     @staticmethod
-    def playerPrimaryPotential(rating: float, age: float, i: int) -> float:
-        return rating + max(0, 30 - age) ** ((age + 25) / 30) * (i - 10) ** 2 / 1600 + random() * (35 - age) / 3 - 2
+    def playerPrimaryPotentials(ratings: np.ndarray, ages: np.ndarray, i: np.ndarray, rng: Generator) -> np.ndarray:
+        '''Returns the potential of every player from their rating, age and index `i` in the squad.'''
+        return ratings + np.maximum(0, 30 - ages) ** ((ages + 25) / 30) * (i - 10) ** 2 / 1600 + rng.random(len(i)) * (35 - ages) / 3 - 2
         
     @staticmethod
     def nationSelectionWeight(fifaRanking: int) -> float:
@@ -891,8 +1700,13 @@ class Calc:
         return float(optaRanking) * 3 / 5 + 27, 1
         
     @staticmethod
-    def freeAgentRating(nationI: int) -> float:
-        return round(FREE_AGENT_AVERAGE_RATING - (nationI / Nation.N) * 15 + 60 * betavariate(1.3, 3.6) - 10 - max(1, 1.02 ** (nationI - Nation.N / 2)))
+    def freeAgentRatings(nationI: np.ndarray, rng: Generator) -> np.ndarray:
+        '''
+        Returns the rating of every free agent of the nation with the index in `nationI` in `Nation.instances`. Weaker nations have weaker free agents.\n
+        The penalty of weak nations grows exponentially with their place in the FIFA ranking, so in databases with more than `FREE_AGENT_NATION_COUNT` nations
+        places are scaled down to that many nations, which keeps ratings in the same range no matter how many nations there are (see `generateDatabase()`).
+        '''
+        return np.round(FREE_AGENT_AVERAGE_RATING - (nationI / Nation.N) * 15 + 60 * rng.beta(1.3, 3.6, len(nationI)) - 10 - np.maximum(1, 1.02 ** ((nationI - Nation.N / 2) * min(1, FREE_AGENT_NATION_COUNT / Nation.N))))
     
     @staticmethod
     def academyOfferCount() -> int:
@@ -907,29 +1721,50 @@ class Calc:
         return 80 + random() * 15 #TODO change this
     
     @staticmethod
-    def playerFoot() -> str:
-        return 'right' if random() < .8 else 'left'
+    def playerLeftFeet(n: int, rng: Generator) -> np.ndarray:
+        '''Returns True for every left-footed player and False for every right-footed one. One in five players is left-footed.'''
+        return rng.random(n) >= .8
     
     @staticmethod
-    def attributeValueFromFramePart(rating: float, framePart: float) -> float:
-        return min(MAX_ATTRIBUTE_VALUE, rating + framePart + sum([random() - .5 for _ in range(6)]))
+    def attributeValuesFromFrames(ratings: np.ndarray, frames: np.ndarray, rng: Generator) -> np.ndarray:
+        '''Returns the attributes of every player from their rating and their frame (see `FrameStore`).'''
+        return np.minimum(MAX_ATTRIBUTE_VALUE, ratings[:, None] + frames + (rng.random((*frames.shape, 6)) - .5).sum(-1))
     
     @staticmethod
     def playerCategoryWeight(cat: float) -> float:
         return cat ** 15
     
     @staticmethod
-    def traitNum() -> int:
-        return max(1, int(round(normalvariate(2.5, 1))))
+    def traitNums(n: int, rng: Generator) -> np.ndarray:
+        '''Returns the number of traits of every player, at least 1.'''
+        return np.maximum(1, np.round(rng.normal(2.5, 1, n))).astype(int)
     
     @staticmethod
-    def generateTrait(weightings: list[float]) -> Trait:
-        return Trait.instances[choices([randint(i, i + 4) for i in range(0, 21, 5)], weights=weightings)[0]]
+    def generateTraits(weightings: np.ndarray, traitNums: np.ndarray, rng: Generator) -> np.ndarray:
+        '''
+        Keeps generating traits until every player has as many different traits as in `traitNums`. A trait is drawn from a category picked by the weightings of the player.\n
+        `weightings` has a row of category weightings for every player. Returns a boolean array with a column for every trait.
+        '''
+        traits = np.zeros((len(traitNums), len(Trait.instances)), bool)
+        cumulativeWeightings = weightings.cumsum(1)
+        missing = np.flatnonzero(traitNums > 0)
+        while len(missing):
+            categories = (rng.random((len(missing), 1)) * cumulativeWeightings[missing, -1:] >= cumulativeWeightings[missing]).sum(1)
+            traits[missing, categories * 5 + rng.integers(0, 5, len(missing))] = True
+            missing = missing[traits[missing].sum(1) < traitNums[missing]]
+        return traits
     
     @staticmethod
     def suitValue(targetPositionScore: float, currentPositionScore: float) -> float:
         return -max(0, sum([3 * random() - .5 for _ in range(max(1, int(targetPositionScore - currentPositionScore + 1.5 * random())))]))
 
+    @staticmethod
+    def suitValues(targetPositionScores: np.ndarray, currentPositionScores: np.ndarray, rng: Generator) -> np.ndarray:
+        '''Vectorized `Calc.suitValue()`. The random sums of every element are added up from one flat array of random values.'''
+        counts = np.maximum(1, np.trunc(targetPositionScores - currentPositionScores + 1.5 * rng.random(currentPositionScores.shape))).astype(int)
+        sums = np.add.reduceat(3 * rng.random(counts.sum()) - .5, np.concatenate(([0], counts.cumsum()[:-1])))
+        return -np.maximum(0, sums.reshape(counts.shape))
+
 ### Classes
 
 class Settings:
@@ -940,6 +1775,9 @@ class Settings:
     - `.viewProgress`
     - `.excTraceback`
     - `.allowRussia`
+    - `.worldSeed`
+    - `.parallelGeneration`
+    - `.lazyGeneration`
     '''
     def __init__(self, progress: bool = False, bar: Progress | None = None, task: TaskID | None = None, value: int | float = 0) -> None:
         '''
@@ -957,6 +1795,9 @@ class Settings:
         self.viewProgress: Setting = self.newSetting()
         self.excTraceback: Setting = self.newSetting()
         self.allowRussia: Setting = self.newSetting()
+        self.worldSeed: Setting = self.newSetting()
+        self.parallelGeneration: Setting = self.newSetting()
+        self.lazyGeneration: Setting = self.newSetting()
         del self._contents, self._progress, self._bar, self._task, self._value
     
     def save(self) -> None:
@@ -999,7 +1840,7 @@ class Setting:
     - `.name`: The name of the setting.
     - `.description`: The description of the setting.
     - `.setTo`: The value that the setting is set to.
-    - `.values`: A list of values that the setting can be set to.
+    - `.values`: A list of values that the setting can be set to. If it contains `NUMBER_SETTING_VALUE`, the setting can be set to any whole number as well.
     - `.instances`: A list of all Setting instances.
     '''
     instances: ClassVar[list[Setting]] = []
@@ -1012,9 +1853,9 @@ class Setting:
         Setting.instances.append(self)
         self.name: str = data['name']
         self.description: str = data['description'].replace(DOUBLE_BACKSLASH_N, BACKSLASH_N)
-        self.setTo: str = data['setTo']
+        self.setTo: str = str(data['setTo'])
         self.values: list[str] = data['values']
-        if not self.setTo in self.values:
+        if not (self.setTo in self.values or (NUMBER_SETTING_VALUE in self.values and self.setTo.isdigit())):
             raise ValidationError(f'{self.name} setting: {self.setTo} is not in {self.values}.')
     
     def view(self) -> str:
@@ -1024,6 +1865,12 @@ class Setting:
     def edit(self) -> None:
         '''Creates a pretty menu that allows the user to edit a setting.'''
         self.setTo = menu('What do you want to change this setting to?', [MenuOption(*colorSettingValue(value, mode = 'color'), self.description, value) for value in self.values])
+        while self.setTo == NUMBER_SETTING_VALUE:
+            number = input('<uyellow>Enter a whole number:</uyellow> ').strip()
+            if number.isdigit():
+                self.setTo = number
+            else:
+                print('<ured>This is not a whole number.</ured>')
         clear()
 
     def __eq__(self, other):
@@ -1060,6 +1907,404 @@ class MenuOption:
         self.description: Any | None = description
         self.returnValue: Any = value
 
+class LoadStep:
+    '''
+    The class for a step of loading the database in `parseDatabase()`.\n
+    Attributes:
+    - `.name`: The name of the step. `parseDatabase()` returns the output of the step under this name.
+    - `.func`: The function that creates objects from the loaded files. It is called with `progress`, `bar`, `task` and `value`.
+    - `.filePaths`: A list of paths of the files the step loads.
+    - `.dependencies`: A list of names of the steps that have to be finished before this step starts.
+    - `.progressValue`: The amount the progress bar moves by during the step.
+    '''
+    def __init__(self, name: str, func: Callable, fileNames: list[str], dependencies: list[str] | None = None, progressValue: int | float = 2) -> None:
+        '''
+        Arguments:
+        - `name`: The name of the step.
+        - `func`: The function that creates objects from the loaded files.
+        - `fileNames`: A list of keys of the `files` dictionary that the step loads.
+        - `dependencies`: A list of names of the steps that have to be finished before this step starts. None if there are none.
+        - `progressValue`: The amount the progress bar moves by during the step.
+        '''
+        self.name: str = name
+        self.func: Callable = func
+        self.filePaths: list[str] = [files[fileName] for fileName in fileNames]
+        self.dependencies: list[str] = dependencies if dependencies else []
+        self.progressValue: int | float = progressValue
+
+    def isReady(self, finished: dict[str, Any]) -> bool:
+        '''Returns True if all steps the step depends on are in `finished` and all of its files are loaded, False otherwise.'''
+        return all(dependency in finished for dependency in self.dependencies) and all(preloadedData[filePath].done() for filePath in self.filePaths if filePath in preloadedData)
+
+class BackgroundLoader:
+    '''
+    The class for running load steps in a background thread while the game is already interactive.\n
+    It is passed to the steps instead of a progress bar and counts how far they got, so that `.wait()` can show a progress bar if the world is needed before it is ready.
+    When the steps are finished, the ranking tables start being made in the background (see `RankingScreens`).\n
+    Attributes:
+    - `.steps`: The load steps.
+    - `.finished`: The outputs of the steps that were already run, by name.
+    - `.total`: The amount the progress bar moves by during all steps.
+    - `.completed`: The amount the progress bar moved by so far.
+    - `.tasks`: The number of progress bar tasks that were added. Only the first one is the one of the steps, the rest are ones of single files.
+    - `.result`: A Future that is set to `(outputs, errorList)` when the steps are finished.
+    - `.thread`: The background thread.
+    '''
+    def __init__(self, steps: list[LoadStep], finished: dict[str, Any]) -> None:
+        '''
+        Arguments:
+        - `steps`: The load steps to run.
+        - `finished`: The outputs of the steps that were already run, by name.
+        '''
+        self.steps: list[LoadStep] = steps
+        self.finished: dict[str, Any] = finished
+        self.total: float = sum([step.progressValue for step in steps])
+        self.completed: float = 0
+        self.tasks: int = 0
+        self.result: Future = Future()
+        self.thread: Thread = Thread(target=self.run, daemon=True)
+        self.thread.start()
+
+    def run(self) -> None:
+        '''Runs the steps. Called in the background thread.'''
+        errorList: list[str] = []
+        try:
+            outputs = runLoadSteps([], self.steps, errorList, self.finished, self, self.add_task('steps', self.total))
+        except BaseException as e:
+            self.result.set_exception(e)
+            return
+        if not (errorList or lazyWorld):
+            RankingScreens.start()
+        self.result.set_result((outputs, errorList))
+
+    def add_task(self, description: str, total: float = 1) -> int:
+        '''Same as `Progress.add_task()`, returns the number of the task.'''
+        self.tasks += 1
+        return self.tasks - 1
+
+    def update(self, task: int, advance: float = 0) -> None:
+        '''Same as `Progress.update()`, only counts the progress of the steps.'''
+        if task == 0:
+            self.completed = min(self.total, self.completed + advance)
+
+    def wait(self) -> dict[str, Any]:
+        '''Waits until the steps are finished, showing their progress if they aren't, and returns their outputs. Exits if any of them failed.'''
+        if not self.result.done():
+            if progressBarSetting():
+                with Progress() as bar:
+                    task = bar.add_task('[green]Generating the world...', total = self.total)
+                    while not self.result.done():
+                        bar.update(task, completed = self.completed)
+                        sleep(.1)
+                    bar.update(task, completed = self.total)
+            else:
+                print('<uyellow>Please wait, the world is still being generated...</uyellow>')
+        outputs, errorList = self.result.result()
+        if errorList:
+            reportDatabaseErrors(errorList)
+        return outputs
+
+class Streams:
+    '''
+    The class for the seeded random streams that world generation draws from.\n
+    Every club and every national pool gets its own stream, made from the world seed and the numbers of the club or nation with numpy's SeedSequence.
+    That way a world only depends on its seed, no matter in what order or in which process its parts are generated.\n
+    Attributes:
+    - `.seed`: The seed of the world, or None before a world is generated.
+    - `.kinds`: A list of kinds of streams. The index of the kind is the first number of the spawn key of a stream.
+    '''
+    seed: ClassVar[int | None] = None
+    kinds: ClassVar[list[str]] = ['club', 'nation']
+
+    @classmethod
+    def reset(cls, seed: int) -> None:
+        '''Sets the seed all streams are made from.'''
+        cls.seed = seed
+
+    @classmethod
+    def stream(cls, kind: str, *numbers: int) -> Generator:
+        '''
+        Returns a new generator for the stream of `kind` with the given `numbers`.\n
+        For example, `Streams.stream('club', leagueI, clubI)` is the stream of the `clubI`th club of the `leagueI`th league in `files['leagues']`.
+        '''
+        return default_rng(SeedSequence(cls.seed, spawn_key = (cls.kinds.index(kind), *numbers)))
+
+class WeightedSampler:
+    '''
+    The class for picking items with fixed weights.
+
+    The cumulative weights are computed once, so every draw is a binary search instead of a pass over all the weights.
+
+    Attributes:
+    - `.items`: A list of the items to pick from.
+    - `.cumulativeWeights`: A list of the running totals of the weights.
+    - `.total`: The sum of all weights.
+    - `.cumulativeArray`: Same as `.cumulativeWeights` but is a NumPy array. Used for drawing many indices at once.
+    '''
+    def __init__(self, items: Iterable, weights: Iterable[float]) -> None:
+        '''
+        Arguments:
+        - `items`: The items to pick from.
+        - `weights`: The weight of each item.
+        '''
+        self.items: list = list(items)
+        self.cumulativeWeights: list[float] = list(accumulate(weights))
+        self.total: float = self.cumulativeWeights[-1]
+        self.cumulativeArray: np.ndarray = np.array(self.cumulativeWeights)
+
+    def draw(self) -> Any:
+        '''Returns a random item.'''
+        return self.items[bisect(self.cumulativeWeights, random() * self.total, 0, len(self.items) - 1)]
+
+    def drawMany(self, k: int) -> list:
+        '''Returns a list of `k` random items. Items can repeat.'''
+        return [self.draw() for _ in range(k)]
+
+    def drawIndices(self, n: int, rng: Generator) -> np.ndarray:
+        '''Returns an array of indices of `n` random items. Draws from `rng`.'''
+        return np.minimum(np.searchsorted(self.cumulativeArray, rng.random(n) * self.total, 'right'), len(self.items) - 1)
+
+class FrameStore:
+    '''
+    The class for the attribute frames that newly generated players are based on.\n
+    All frames are kept in one contiguous array, so picking a frame is index arithmetic instead of a lookup in nested lists.
+    The array is compiled from `files['frames']` once and saved to a binary file which is memory-mapped on the next launches (see `FrameStore.load()`).\n
+    Attributes:
+    - `.values`: An array of all frames, one row of 6 values per frame. Frames of the same rating and position are next to each other.
+    - `.offsets`: An array of the index of the first frame of every rating and position in `.values`. The frames of `rating` and `position` end at `.offsets[rating - .minRating, position + 1]`.
+    - `.positionIndices`: A dictionary of the column of every position in `.offsets` by its short name.
+    - `.minRating`: The lowest rating that has frames.
+    '''
+    def __init__(self, values: np.ndarray, offsets: np.ndarray, positionIndices: dict[str, int], minRating: int) -> None:
+        '''
+        Arguments:
+        - `values`: An array of all frames.
+        - `offsets`: An array of the index of the first frame of every rating and position.
+        - `positionIndices`: A dictionary of the column of every position in `offsets` by its short name.
+        - `minRating`: The lowest rating that has frames.
+        '''
+        self.values: np.ndarray = values
+        self.offsets: np.ndarray = offsets
+        self.positionIndices: dict[str, int] = positionIndices
+        self.minRating: int = minRating
+
+    @classmethod
+    def fromData(cls, data: dict[int, dict[str, list[list[float]]]]) -> FrameStore:
+        '''Compiles the nested frames `data` (rating -> position -> list of frames) loaded from `files['frames']`.'''
+        minRating, maxRating = min(data), max(data)
+        positionIndices = {position: i for i, position in enumerate(dict.fromkeys(position for positions in data.values() for position in positions))}
+        counts = np.zeros((maxRating - minRating + 1, len(positionIndices) + 1), np.int64)
+        values = []
+        for rating in range(minRating, maxRating + 1):
+            for position in positionIndices:
+                ratingFrames = data.get(rating, {}).get(position, [])
+                counts[rating - minRating, positionIndices[position] + 1] = len(ratingFrames)
+                values += ratingFrames
+        offsets = counts.ravel().cumsum().reshape(counts.shape)
+        return cls(np.array(values, np.float32).reshape(-1, 6), offsets, positionIndices, minRating)
+
+    @staticmethod
+    def storePath(filePath: str) -> str:
+        '''Returns the path of the compiled store of `filePath`. `database/frames.db` -> `cache/database-frames.db.frames`.'''
+        return CACHE_DIRECTORY + cacheFileName(filePath) + FRAME_STORE_EXTENSION
+
+    @staticmethod
+    def key(filePath: str) -> str:
+        '''Returns the hash of `FRAME_STORE_VERSION` and the contents of `filePath`. A compiled store is only valid if its key matches.'''
+        with open(filePath, 'rb') as f:
+            return yamlToHash(bytes(str(FRAME_STORE_VERSION), 'utf8') + f.read())
+
+    @classmethod
+    def isCompiled(cls, filePath: str) -> bool:
+        '''Returns True if `filePath` has a compiled store that matches its current contents, False otherwise.'''
+        try:
+            with open(cls.storePath(filePath), 'rb') as f:
+                return f.readline().rstrip(b'\n') == cls.key(filePath).encode()
+        except OSError:
+            return False
+
+    @classmethod
+    def load(cls, filePath: str) -> FrameStore:
+        '''
+        Returns the frames of `filePath`. The compiled store is memory-mapped if it is valid, so only the frames that are used are read from the disk.\n
+        Otherwise the file is loaded with `loadData()`, compiled and saved for the next launch.
+        '''
+        key = cls.key(filePath)
+        try:
+            with open(cls.storePath(filePath), 'rb') as f:
+                header = f.read(FRAME_STORE_HEADER_SIZE).decode('utf-8').split('\n')
+            if header[0] == key:
+                positions, (minRating, ratingCount, frameCount) = header[1].split(), map(int, header[2].split())
+                offsets = np.memmap(cls.storePath(filePath), np.int64, 'r', FRAME_STORE_HEADER_SIZE, (ratingCount, len(positions) + 1))
+                values = np.memmap(cls.storePath(filePath), np.float32, 'r', FRAME_STORE_HEADER_SIZE + offsets.nbytes, (frameCount, 6))
+                return cls(values, np.array(offsets), {position: i for i, position in enumerate(positions)}, minRating)
+        except (OSError, UnicodeDecodeError, ValueError, IndexError):
+            pass
+        store = cls.fromData(loadData(filePath))
+        store.save(cls.storePath(filePath), key)
+        return store
+
+    def save(self, storePath: str, key: str) -> bool:
+        '''
+        Saves the store to `storePath`. The first line of the file is `key` (see `FrameStore.key()`), followed by the positions and the sizes of the arrays.
+        The arrays start at `FRAME_STORE_HEADER_SIZE`.\n
+        Returns True if saving was successful or False otherwise.
+        '''
+        header = f'{key}\n{" ".join(self.positionIndices)}\n{self.minRating} {len(self.offsets)} {len(self.values)}\n'.encode()
+        try:
+            makedirs(CACHE_DIRECTORY, exist_ok = True)
+            with open(storePath, 'wb') as f:
+                f.write(header.ljust(FRAME_STORE_HEADER_SIZE, b'\0') + self.offsets.tobytes() + self.values.tobytes())
+            return True
+        except (OSError, ValueError):
+            return False
+
+    def rows(self, ratings: np.ndarray, columns: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+        '''Returns the first frame and the number of frames of every rating (rounded) and position column in the given arrays.'''
+        ratingRows = np.clip(np.rint(ratings).astype(np.int64) - self.minRating, 0, len(self.offsets) - 1)
+        starts = self.offsets[ratingRows, columns]
+        return starts, self.offsets[ratingRows, columns + 1] - starts
+
+    def sampleMany(self, ratings: np.ndarray, columns: np.ndarray, rng: Generator) -> np.ndarray:
+        '''Returns an array of one random frame for every rating and position column (see `.positionIndices`) in the given arrays. Draws from `rng`.'''
+        starts, counts = self.rows(ratings, columns)
+        return np.asarray(self.values[starts + (rng.random(len(starts)) * counts).astype(np.int64)], float)
+
+class RankingScreens:
+    '''
+    The class for the cache of ranking tables.\n
+    After the world is loaded, `RankingScreens.start()` makes the tables of every ranking screen and sort mode in a background thread, so that they are ready by the time the user opens them.
+    Any change to the world (see `Club.clearRating()` and `Player.__setattr__()`) throws the cache away with `RankingScreens.invalidate()`.\n
+    Attributes:
+    - `.screens`: A dictionary of the function that makes the table and the sort modes, by screen.
+    - `.cache`: A dictionary of tables by `(screen, mode)`.
+    - `.lock`: The lock that is held while a table is made, so the same table is never made twice at once.
+    - `.worker`: The background thread, or None if it isn't running.
+    '''
+    screens: ClassVar[dict[str, tuple[Callable[[str], Table], tuple[str, ...]]]] = {
+        'nations': (nationRankingsTable, ('fifa-ranking', 'rating')),
+        'leagues': (leagueRankingsTable, ('average', 'top', 'median')),
+        'clubs': (lambda mode: clubRankingsTable(), ('rating',)),
+        'players': (playerRankingsTable, ('rating', 'potential')),
+    }
+    cache: ClassVar[dict[tuple[str, str], Table]] = {}
+    lock: ClassVar[RLock] = RLock()
+    worker: ClassVar[Thread | None] = None
+
+    @classmethod
+    def get(cls, screen: str, mode: str = 'rating') -> Table:
+        '''Returns the table of `screen` sorted by `mode`, made now if it isn't cached yet.'''
+        with cls.lock:
+            cache = cls.cache
+            if (screen, mode) not in cache:
+                cache[screen, mode] = cls.screens[screen][0](mode)
+            return cache[screen, mode]
+
+    @classmethod
+    def invalidate(cls) -> None:
+        '''Throws away all cached tables. The background thread stops after the table it is making, and that table isn't kept.'''
+        if cls.cache or cls.worker:
+            cls.cache = {}
+
+    @classmethod
+    def start(cls) -> None:
+        '''Starts making all tables in a background thread.'''
+        cls.invalidate()
+        cls.worker = Thread(target=cls.precompute, args=(cls.cache,), daemon=True)
+        cls.worker.start()
+
+    @classmethod
+    def precompute(cls, cache: dict[tuple[str, str], Table]) -> None:
+        '''Makes the tables of all screens into `cache` until `cache` is thrown away.'''
+        try:
+            for screen, (makeTable, modes) in cls.screens.items():
+                for mode in modes:
+                    with cls.lock:
+                        if cls.cache is not cache:
+                            return
+                        if (screen, mode) not in cache:
+                            cache[screen, mode] = makeTable(mode)
+        finally:
+            if cls.worker is current_thread():
+                cls.worker = None
+
+class OutputBuffer:
+    '''
+    The context manager that collects everything `print()` prints inside of it and writes it to the terminal at once when the outermost one exits.\n
+    The collected text is parsed by prompt_toolkit's HTML parser once. If it can't be parsed, every fragment is printed separately like `print()` does, falling back to `origPrint()`.
+    `input()` and `clear()` flush the buffer first, so buffered output never ends up after a prompt.\n
+    Example:
+    ```
+    with OutputBuffer():
+        for line in lines:
+            print(line)
+    ```
+    Attributes:
+    - `.fragments`: A list of `(text, end)` pairs printed since the last flush.
+    - `.depth`: The number of `with OutputBuffer()` blocks that are currently entered.
+    '''
+    fragments: ClassVar[list[tuple[str, str]]] = []
+    depth: ClassVar[int] = 0
+
+    def __enter__(self) -> OutputBuffer:
+        OutputBuffer.depth += 1
+        return self
+
+    def __exit__(self, *exception: Any) -> None:
+        OutputBuffer.depth -= 1
+        if not OutputBuffer.depth:
+            OutputBuffer.flush()
+
+    @staticmethod
+    def flush() -> None:
+        '''Writes the collected fragments to the terminal.'''
+        if not OutputBuffer.fragments:
+            return
+        fragments = OutputBuffer.fragments
+        OutputBuffer.fragments = []
+        try:
+            print_formatted_text(HTML(''.join([text + end for text, end in fragments])), end = '', style = mainStyle)
+        except (ExpatError, NameError, ValueError, TypeError, AttributeError):
+            for text, end in fragments:
+                try:
+                    print_formatted_text(HTML(text), end = end, style = mainStyle)
+                except (NameError, ValueError, TypeError, AttributeError):
+                    origPrint(text, end = end)
+
+class Markup:
+    '''
+    The class for the color codes of `mainStyleDict`, used by `uncolor()` and `richFormat()`.\n
+    All codes are compiled into one regular expression, so every string is scanned once instead of once per code.\n
+    Attributes:
+    - `.styleDict`: The `mainStyleDict` the expression was compiled for, or None before it exists.
+    - `.pattern`: The compiled expression that matches opening and closing tags of all codes.
+    - `.richTags`: A dictionary of Rich markup for every tag.
+    - `.uncolored`: A dictionary of uncolored strings by string. It is cleared when it has `MARKUP_CACHE_SIZE` strings or the style changes.
+    '''
+    styleDict: ClassVar[dict[str, str] | None] = None
+    pattern: ClassVar[Pattern[str]]
+    richTags: ClassVar[dict[str, str]]
+    uncolored: ClassVar[dict[str, str]] = {}
+
+    @classmethod
+    def update(cls) -> bool:
+        '''Compiles the codes of `mainStyleDict` if they changed. Returns False if `mainStyleDict` doesn't exist yet.'''
+        try:
+            styleDict = mainStyleDict
+        except NameError:
+            return False
+        if cls.styleDict is not styleDict:
+            cls.styleDict = styleDict
+            cls.pattern = compileRegex('</?(?:' + '|'.join(escapeRegex(code) for code in sorted(styleDict, key=len, reverse=True)) + ')>') if styleDict else compileRegex('(?!)')
+            cls.richTags = {f'<{code}>': f'[{color.replace("bg:", "on ")}]' for code, color in styleDict.items()} | {f'</{code}>': '[/]' for code in styleDict}
+            cls.uncolored = {}
+        return True
+
+    @classmethod
+    def richTag(cls, match: Match[str]) -> str:
+        '''Returns the Rich markup for a tag matched by `.pattern`.'''
+        return cls.richTags[match.group()]
+
 class Table:
     '''
     The class for a table.\n
@@ -1144,9 +2389,10 @@ class Table:
                 
         self.columns: list[Row] = [Row(*column) for column in zip(*[row.cells for row in self.data])]
     
-    def getPrintable(self) -> str:
-        '''Get the representation of the table as a string.'''
-        columnLens = [max(len(header.ucText), *[len(text) for text in column.ucCells]) for header, column in zip(self.headers, self.columns)]
+    def getPrintable(self, columnLens: list[int] | None = None) -> str:
+        '''Get the representation of the table as a string. Column widths are measured from the cells unless `columnLens` is given.'''
+        if columnLens is None:
+            columnLens = [max(len(header.ucText), *[len(text) for text in column.ucCells]) for header, column in zip(self.headers, self.columns)]
 
         if not self.title:
             table = ''
@@ -1196,6 +2442,7 @@ class Table:
         '''Prints the table, captures the user's input and returnes it.'''
         return self.print(True)
 
+    @buffered
     def print(self, inputToo: bool = False) -> None | str:
         '''
         Prints the table.
@@ -1207,6 +2454,87 @@ class Table:
         if inputToo:
             return input(self.caption + ('' if uncolor(self.caption)[-len(self.caption.splitlines())] == ' ' else ' ') if self.caption else '')
 
+class PagedTable(Table):
+    '''
+    The class for a table that is shown one page at a time.\n
+    Rows are made by a function only when their page is shown, so a table can have as many rows as there are players in the world.
+    Column widths are measured once so that they don't change between pages.\n
+    Attributes (in addition to the ones of `Table`, `.data` and `.columns` only contain the rows of the current page):
+    - `.rowCount`: The number of rows in the table.
+    - `.getRow`: A function that returns the cells of a row by its index.
+    - `.columnLens`: The widths of the columns.
+    - `.page`: The index of the current page.
+    '''
+    def __init__(self, rowCount: int, getRow: Callable[[int], list[Any]], headers: list[Header] | list[str], title: str | None = None, caption: str | None = None, style: dict[str, str] | None = None, columnLens: list[int | None] | None = None) -> None:
+        '''
+        Arguments:
+        - `rowCount`: The number of rows in the table.
+        - `getRow`: A function that returns the cells of a row by its index.
+        - `headers`: The table's headers. Can be a list of Header objects or a list of strings.
+        - `title`: The table's title.
+        - `caption`: Printed below the table.
+        - `style`: `Table.defaultStyle` if set to None.
+        - `columnLens`: The widths of the cells of every column. Columns that are not given or are None are measured from all rows, so it is best to give all of them for big tables.
+        '''
+        super().__init__([], headers, title, caption, style)
+        self.rowCount: int = rowCount
+        self.getRow: Callable[[int], list[Any]] = getRow
+        columnLens = list(columnLens or [])
+        columnLens += [None] * (len(self.headers) - len(columnLens))
+        missing = [column for column, columnLen in enumerate(columnLens) if columnLen is None]
+        if missing:
+            measured = dict.fromkeys(missing, 0)
+            for i in range(rowCount):
+                row = self.getRow(i)
+                for column in missing:
+                    measured[column] = max(measured[column], len(uncolor(str(row[column]))))
+            columnLens = [measured.get(column, columnLen) for column, columnLen in enumerate(columnLens)]
+        self.columnLens: list[int] = [max(len(header.ucText), columnLen) for header, columnLen in zip(self.headers, columnLens)]
+        self.page: int = 0
+
+    @property
+    def pageSize(self) -> int:
+        '''The number of rows that fit in the terminal with the title, the headers, the borders and the caption.'''
+        return max(1, terminalHeight() - 6 - len((self.caption or '').splitlines()) - bool(self.title))
+
+    @property
+    def pageCount(self) -> int:
+        return max(1, -(-self.rowCount // self.pageSize))
+
+    def getPrintable(self, columnLens: list[int] | None = None) -> str:
+        '''Get the representation of the current page as a string.'''
+        self.page = min(self.page, self.pageCount - 1)
+        start = self.page * self.pageSize
+        self.data = [Row(*self.getRow(i)) for i in range(start, min(start + self.pageSize, self.rowCount))]
+        self.columns = [Row(*column) for column in zip(*[row.cells for row in self.data])]
+        return super().getPrintable(columnLens or self.columnLens)
+
+    def input(self) -> str:
+        '''
+        Shows the table page by page until the user goes back and returns their last input.\n
+        Enter shows the next page (or goes back on the last one), "p" shows the previous one and a number jumps to the page with that row.
+        Anything else goes back.
+        '''
+        while True:
+            clear()
+            caption = self.caption
+            self.caption = f'<grey>Page <lgrey>{self.page + 1}</lgrey> of <lgrey>{self.pageCount}</lgrey>. Press Enter for the next page, type "p" for the previous one or a row number to jump to it.</grey>' + (f'\n{caption}' if caption else '')
+            try:
+                result = self.print(True)
+            finally:
+                self.caption = caption
+            command = result.strip().lower()
+            if not command:
+                if self.page >= self.pageCount - 1:
+                    return result
+                self.page += 1
+            elif command == 'p':
+                self.page = max(0, self.page - 1)
+            elif command.isdigit():
+                self.page = max(0, min(int(command), self.rowCount) - 1) // self.pageSize
+            else:
+                return result
+
 class Header:
     '''
     The class for a table header.\n
@@ -1253,7 +2581,8 @@ class Nation(ColorText, Find):
     - `.fifaRanking`: The FIFA ranking of the nation.
     - `.leagues`: A list of League objects that belong to the nation.
     - `.clubs`: A list of Club objects that belong to the nation.
-    - `.players`: A list of Player objects that belong to the nation.
+    - `.players`: A list of Player objects that belong to the nation. Generates the rest of a lazy world first (see `genPendingSquads()`).
+    - `.playerList`: Same as `.players` but never generates anything.
     - `.formattedLeagues`: A string that contains nicely formatted full names of the leagues the nation has.
     - `.color`: The main color of the nation.
     - `.names`: A list of all names of the nation.
@@ -1268,12 +2597,14 @@ class Nation(ColorText, Find):
     - `.instances`: A list of all Nation instances except the free agents one.
     - `.teams`: A list of all national teams.
     - `.N`: The number of nations in the game.
+    - `.sampler`: A WeightedSampler that picks nations of foreign players by their FIFA ranking.
     '''
     instances: ClassVar[list[Nation]] = []
+    sampler: ClassVar[WeightedSampler]
     teams: ClassVar[list[Club]] = []
     N: ClassVar[int] = 0
     
-    def __init__(self, names: list[str], shortName: str, nationality: str, color: str, fifaRanking: int, firstNames: list[str], lastNames: list[str]) -> None:
+    def __init__(self, names: list[str], shortName: str, nationality: str, color: str, fifaRanking: int, firstNames: list[str], lastNames: list[str], register: bool = True) -> None:
         '''
         Arguments:
         - `nationNames`: All names of the nation.
@@ -1283,8 +2614,10 @@ class Nation(ColorText, Find):
         - `fifaRanking`: The FIFA ranking of the nation.
         - `firstNames`: Some first names of the people of the nation.
         - `lastNames`: Some last names of the people of the nation.
+        - `register`: If False, the nation is not added to `Nation.instances` and `Nation.N`. Used for the nation of free agents.
         '''
-        Nation.instances.append(self)
+        if register:
+            Nation.instances.append(self)
         self.color: str = color
         self.ucName: str = names[0]
         self.ucNames: list[str] = names
@@ -1299,10 +2632,20 @@ class Nation(ColorText, Find):
         self.lastNames: list[str] = lastNames
         self.leagues: list[League] = []
         self.clubs: list[Club] = []
-        self.players: list[Player] = []
+        self.playerList: list[Player] = []
         self.searchOptions: list[str] = [str(self.fifaRanking), self.ucShortName.lower()] + [nationName.lower() for nationName in self.ucNames]
         self.team = Club(-1, self.ucName, self.ucNames, f'The {self.nationality} Team', self.ucShortName, [self.color, 'default'], nationalTeam=True)
-        Nation.N += 1
+        if register:
+            Nation.N += 1
+
+    @property
+    def players(self) -> list[Player]:
+        genPendingSquads()
+        return self.playerList
+
+    @players.setter
+    def players(self, players: list[Player]) -> None:
+        self.playerList = players
 
     def pickTeam(self):
         self.team.players = sorted(self.players, key=lambda x: x.rating, reverse=True)[:NATION_SQUAD_SIZE]
@@ -1316,6 +2659,7 @@ class Nation(ColorText, Find):
     def formattedLeagues(self) -> str:
         return ', '.join([league.name for league in self.leagues])
 
+    @buffered
     def viewProfile(self, caption: str = '<uyellow>Press Enter to go back to the start menu: </uyellow>', end: bool = True) -> None:
         '''Shows the profile of the nation.'''
         clear()
@@ -1334,7 +2678,7 @@ class Nation(ColorText, Find):
             Table(tableRows, tableHeaders, f'<bold>Best leagues in {self.ucName}:</bold>').print()
         if self.players:
             tableHeaders = ['№', 'Full name', 'Nat', 'Club', 'Pos', Header('Pac', columnColor='uyellow'), Header('Sho', columnColor='ured'), Header('Pas', columnColor='ucyan'), Header('Dri', columnColor='umagenta'), Header('Dfn', columnColor='ugreen'), Header('Phy', columnColor='uwhite'), Header('Foot', 'left', columnColor='uorange'), Header('Age', columnColor='lbrown'), Header('OVR', columnColor='uwhite'), Header('POT', columnColor='dgreen')]
-            tableRows = [[i, p.fullName, p.nation.shortName, p.club.name, p.position.shortName, *p.iattributes, p.foot, p.iage, p.irating, p.ipotential] for i, p in enumerate(sorted(self.players, key=lambda x: x.rating, reverse=True)[:10], 1)]
+            tableRows = [[i, p.fullName, p.nation.shortName, p.club.name, p.position.shortName, *p.iattributes, p.foot, p.iage, p.irating, p.ipotential] for i, p in enumerate(sorted(self.players, key=lambda x: x.rating, reverse=True)[:10] if self is freeAgents.nation else rankings.top(10, 'rating', 'nation', self), 1)]
             Table(tableRows, tableHeaders, '<bold>Best free agents by overall:</bold>' if self is freeAgents.nation else f'<bold>Best players from {self.ucName}:</bold>').print()
         if len(self.players) >= 100 or self is freeAgents.nation:
             tableHeaders = ['№', 'Full name', 'Nat', 'Club', 'Pos', Header('Pac', columnColor='uyellow'), Header('Sho', columnColor='ured'), Header('Pas', columnColor='ucyan'), Header('Dri', columnColor='umagenta'), Header('Dfn', columnColor='ugreen'), Header('Phy', columnColor='uwhite'), Header('Foot', 'left', columnColor='uorange'), Header('Age', columnColor='lbrown'), Header('OVR', columnColor='uwhite'), Header('POT', columnColor='dgreen')]
@@ -1352,12 +2696,17 @@ class Trait(ColorText, Find):
     - `.name`: The name of the trait.
     - `.description`: The description of the trait.
     - `.category`: The category of the trait.
+    - `.bit`: The bit of the trait in trait masks of players. Same as `1 << (.ucNum - 1)`.
     - `.uc{Attribute}`: Same as `.{attribute}` but contains uncolored text instead of colored.
     - `.instances`: A list of all Trait instances.
     - `.categories`: A list of all categories that Trait instances have. Categories don't repeat.
+    - `.bits`: A dictionary of the bit of every trait by each of its search options.
+    - `.categoryMasks`: A dictionary of masks of all traits of every category by the uncolored category.
     '''
     instances: ClassVar[list[Trait]] = []
     categories: ClassVar[list[str]] = []
+    bits: ClassVar[dict[str, int]] = {}
+    categoryMasks: ClassVar[dict[str, int]] = {}
     
     def __init__(self, name: str, description: str, color: str, category: str) -> None:
         '''
@@ -1378,6 +2727,30 @@ class Trait(ColorText, Find):
         self.ucDescription: str = description
         self.ucCategory: str = category
         self.searchOptions: list[str] = [str(self.ucNum), self.ucName.lower()]
+        self.bit: int = 1 << (self.ucNum - 1)
+
+    @classmethod
+    def bitOf(cls, trait: Trait | str) -> int:
+        '''Returns the bit of `trait`. `trait` must be a Trait object or be in `.searchOptions` of one.'''
+        if isinstance(trait, Trait):
+            return trait.bit
+        try:
+            return cls.bits[str(trait).lower()]
+        except KeyError:
+            return cls.find(trait, True).bit
+
+    @staticmethod
+    def maskOf(traits: Iterable[Trait]) -> int:
+        '''Returns the mask of all `traits`.'''
+        mask = 0
+        for trait in traits:
+            mask |= trait.bit
+        return mask
+
+    @classmethod
+    def fromMask(cls, mask: int) -> list[Trait]:
+        '''Returns a list of all traits in `mask` sorted by their numbers.'''
+        return [trait for trait in cls.instances if mask & trait.bit]
 
     @classmethod
     def printInstances(cls) -> None:
@@ -1399,9 +2772,12 @@ class Position(ColorText):
     - `.name`: The full name of the position.
     - `.shortName`: The short name of the position.
     - `.uc{Attribute}`: Same as `.{attribute}` but contains uncolored text instead of colored.
+    - `.index`: The index of the position in `.instances`.
     - `.instances`: A list of all Position instances.
+    - `.sampler`: A WeightedSampler that picks positions of generated players.
     '''
     instances: ClassVar[list[Position]] = []
+    sampler: ClassVar[WeightedSampler]
     
     def __init__(self, shortName: str, name: str, color: str, weightings: list[float], setPieceKoe: float, modifier: float) -> None:        
         '''
@@ -1413,6 +2789,7 @@ class Position(ColorText):
         - `setPieceKoe`: The probability of a player in this position having a set piece related trait.
         - `modifier`: The modifier used to calculate the overall of a player.
         '''
+        self.index: int = len(Position.instances)
         Position.instances.append(self)
         self.weightings: list[float] = weightings
         self.setPieceKoe: float = setPieceKoe
@@ -1432,10 +2809,11 @@ class Player(ColorText):
     - `.club`: The club of the player.
     - `.attributes`: Shortcut for `[.pac, .sho, .pas, .dri, .dfn, .phy]`.
     - `.foot`: The primary foot of the player (`'left'` or `'right'`).
-    - `.traits`: A list of traits that the player has.
-    - `.suit`: A dictionary containing a `float` for every position. The higher the `float`, the better the player is suited to this position. 0 is the maximum value of the `float`.
+    - `.traits`: A list of traits that the player has sorted by their numbers. Made from `.traitMask` when it is read.
+    - `.traitMask`: The traits of the player as a mask of their bits (see `Trait.bit`).
+    - `.suit`: An array containing a `float` for every position in the order of `Position.instances` (use `.suit[position.index]`). The higher the `float`, the better the player is suited to this position. 0 is the maximum value of the `float`.
     - `.position`: The primary position of the player.
-    - `.positions`: A list of all positions sorted by `.suit[position]` in descending order.
+    - `.positions`: A list of all positions sorted by `.suit[position.index]` in descending order.
     - `.secondaryPositions`: A list of the secondary positions the player has.
     - `.fullSecondaryPositions`: A string that contains nicely formatted full names of the secondary positions the player has.
     - `.shortSecondaryPositions`: Same as `.fullSecondaryPositions` but contains short names insted of full.
@@ -1447,63 +2825,93 @@ class Player(ColorText):
     - `.shirtName`: The short name of the position.
     - `.uc{Attribute}`: Same as `.{attribute}` but contains uncolored text instead of colored.
     - `.i{attribute}`: Same as `.{attribute}` but is of type `int` instead of `float`.
-    - `.instances`: A list of all Position instances.
+    - `.instances`: A list of all Position instances.\n
+    - `.ratingCache`: The cached `.rating`, or None if it has to be calculated again (see `.cacheRating()`).
+    - `.positionOrder`: The cached indices of `.positions` in `Position.instances` as bytes. Only valid if `.ratingCache` is not None.
+    - `.secondaryCount`: The cached number of secondary positions, or None until they are needed. They come right after the two best positions in `.positionOrder`.
+    - `.ratingAttributes`: A set of names of the attributes that the cache is calculated from. Setting any of them clears the cache.
+    - `.descriptionCache`: The cached `.pureDescription`, or None if it has to be found again.
+    - `.descriptionAttributes`: Same as `.ratingAttributes` but for `.descriptionCache`.
+    - `.rankingAttributes`: A set of names of the attributes that change the place of the player in `rankings`.\n
+    Players use `__slots__` and keep only uncolored names, colored ones are made when they are shown, as there are tens of thousands of players.
     '''
+    __slots__ = ('age', 'nation', 'club', 'pac', 'sho', 'pas', 'dri', 'dfn', 'phy', 'foot', 'traitMask', 'suit', 'potential', 'squad', 'ucFullName', 'ucShirtName', 'ratingCache', 'positionOrder', 'secondaryCount', 'descriptionCache')
     instances: ClassVar[list[Player]] = []
-    def __init__(self, nation: Nation | None, rating: float | None, potential: float | None, position: Position | None = None, age: int | float = DEFAULT_PLAYER_AGE, squad: str = ''):
+    ratingAttributes: ClassVar[frozenset[str]] = frozenset(['pac', 'sho', 'pas', 'dri', 'dfn', 'phy', 'foot', 'traitMask', 'suit'])
+    descriptionAttributes: ClassVar[frozenset[str]] = ratingAttributes | {'age', 'nation'}
+    rankingAttributes: ClassVar[frozenset[str]] = ratingAttributes | {'potential', 'club', 'nation'}
+    def __init__(self, age: int | float = DEFAULT_PLAYER_AGE) -> None:
         '''
+        Adds the player to `Player.instances`. Only heroes are made this way and set the rest of the fields themselves (see `Hero`),
+        generated players are made from records with `Player.fromRecord()` (see `genPlayerRecords()`).\n
         Arguments:
-        - `nation`: The nation of the player.
-        - `rating`: The rating of the player.
-        - `potential`: The potential of the player.
-        - `position`: The primary position of the player.
         - `age`: The age of the player.
-        - `squad`: The squad that the player is currently in. For example, `'U18'`.
         '''
         Player.instances.append(self)
         self.age: float = age
-        if isinstance(self, Hero):
-            self.squad = 'U18'
-            self.potential = Calc.heroPotential()
-            return
-        if nation is None or rating is None or potential is None or position is None:
-            raise ValidationError("Player.__init__(): nation, rating, potential, and position are required for non-Hero players.")
-        self.nation: Nation = nation
-        self.attributes = [Calc.attributeValueFromFramePart(rating, framePart) for framePart in choice(frames[round(rating)][position.ucShortName])]
-        self.foot = Calc.playerFoot()
-        self.traits: list[Trait] = []
-        categories: list[float] = [(self.phy + self.pac) / 2, self.sho, (self.pas + self.dri) / 2, self.dfn]
-        weightings: list[float] = [Calc.playerCategoryWeight(cat) for cat in categories]
-        wsum: float = sum(weightings)
-        weightings: list[float] = [w / wsum * (1 - position.setPieceKoe) for w in weightings] + [position.setPieceKoe]
-        traitNum: int = Calc.traitNum()
-        while len(self.traits) < traitNum:
-            toAppend: Trait = Calc.generateTrait(weightings)
-            if not toAppend in self.traits:
-                self.traits.append(toAppend)
-        self.suit = self.genSuit(position)
-        # input(str({a.ucName: self.rating + b for a, b in zip(self.suit.keys(), self.suit.values())}) + '\n' + str(self.attributes) + '\n')
-        self.potential = min(MAX_ATTRIBUTE_VALUE, max(self.rating, potential))
-        self.squad = squad
-        self.ucShirtName = choice(self.nation.lastNames)
-        self.ucFullName = f'{choice(self.nation.firstNames)} {self.ucShirtName}'
-        self.fullName = self.colorText(self.ucFullName)
-        self.shirtName = self.colorText(self.ucShirtName)
-        self.nation.players.append(self)
+
+    @classmethod
+    def fromRecord(cls, record: tuple) -> Player:
+        '''Creates a player from a `record` returned by `Player.toRecord()` without generating anything. The player isn't added to any club.'''
+        nationRanking, attributes, foot, traitNums, suit, potential, age, squad, ucFullName, ucShirtName = record
+        self = cls.__new__(cls)
+        Player.instances.append(self)
+        # A new player has no cache to clear, so the fields are set without going through `Player.__setattr__()`
+        setField = object.__setattr__
+        for name, value in zip(('ratingCache', 'descriptionCache', 'age', 'nation', 'pac', 'sho', 'pas', 'dri', 'dfn', 'phy', 'foot', 'traitMask', 'suit', 'potential', 'squad', 'ucShirtName', 'ucFullName'), (None, None, age, Nation.instances[nationRanking - 1], *attributes, foot, sum(1 << (traitNum - 1) for traitNum in traitNums), array('d', suit), potential, squad, ucShirtName, ucFullName)):
+            setField(self, name, value)
+        self.nation.playerList.append(self)
+        return self
+
+    def toRecord(self) -> tuple:
+        '''Returns the player as a tuple of plain values that can be saved and turned back into a player with `Player.fromRecord()`.'''
+        return (self.nation.fifaRanking, self.attributes, self.foot, [trait.ucNum for trait in self.traits], self.suit.tolist(), self.potential, self.age, self.squad, self.ucFullName, self.ucShirtName)
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        object.__setattr__(self, name, value)
+        if name in Player.rankingAttributes and rankings.groups:
+            rankings.markDirty(self)
+            RankingScreens.invalidate()
+        if name in Player.descriptionAttributes:
+            object.__setattr__(self, 'descriptionCache', None)
+            if name in Player.ratingAttributes:
+                object.__setattr__(self, 'ratingCache', None)
+                if getattr(self, 'club', None):
+                    self.club.clearRating()
+                if hasattr(self, 'nation'):
+                    self.nation.team.clearRating()
+
+    def cacheRating(self) -> float:
+        '''
+        Calculates `.rating` and the order of `.positions` and saves them until an attribute they depend on changes. Returns the rating.\n
+        The cache is kept in plain values instead of lists, so it adds no objects for the garbage collector to track.
+        '''
+        if hasattr(self, 'suit'):
+            order = sorted(range(len(self.suit)), key = self.suit.__getitem__, reverse = True)
+        else:
+            order = sorted(range(len(Position.instances)), key = lambda i: self.getPositionScore(Position.instances[i]), reverse = True)
+        self.positionOrder = bytes(order)
+        self.secondaryCount = None
+        self.ratingCache = self.getPositionScore(Position.instances[order[0]])
+        return self.ratingCache
 
     @property
     def position(self) -> Position:
-        return self.positions[0]
+        if self.ratingCache is None:
+            self.cacheRating()
+        return Position.instances[self.positionOrder[0]]
         
     @property
     def secondaryPositions(self) -> list[Position]:
-        toReturn = []
-        positions = self.positions
-        positions.remove(self.position)
-        for position in positions[1:]:
-            if self.suit[position] >= -SECONDARY_POSITION_KOE:
-                toReturn.append(position)
-        return toReturn
+        if self.ratingCache is None:
+            self.cacheRating()
+        if self.secondaryCount is None:
+            self.secondaryCount = 0
+            for i in self.positionOrder[2:]:
+                if self.suit[i] < -SECONDARY_POSITION_KOE:
+                    break
+                self.secondaryCount += 1
+        return [Position.instances[i] for i in self.positionOrder[2:2 + self.secondaryCount]]
     
     @property
     def fullSecondaryPositions(self) -> str:
@@ -1517,51 +2925,93 @@ class Player(ColorText):
     
     @property
     def positions(self) -> list[Position]:
-        return sorted(Position.instances, key = lambda x: self.suit[x] if hasattr(self, 'suit') else self.getPositionScore(x), reverse=True)
+        if self.ratingCache is None:
+            self.cacheRating()
+        return [Position.instances[i] for i in self.positionOrder]
 
     @property
     def descriptionDict(self) -> dict[str, float]:
+        return self.scoreDescriptions(Player.descriptionMasks())
+
+    @staticmethod
+    def descriptionMasks() -> tuple[int, ...]:
+        '''Returns the trait masks that `.scoreDescriptions()` reads: the Technical, Attacking and Set Piece category masks, then the bits of Weak Foot, Header, Aerial, Flair, Trickster, Engine and Fox.'''
+        return (*(Trait.categoryMasks[category] for category in ('Technical', 'Attacking', 'Set Piece')), *(Trait.bitOf(trait) for trait in ('Weak Foot', 'Header', 'Aerial', 'Flair', 'Trickster', 'Engine', 'Fox')))
+
+    def scoreDescriptions(self, masks: tuple[int, ...]) -> dict[str, float]:
+        '''Returns the score of every description of the player, `masks` must come from `Player.descriptionMasks()`.'''
+        technicalMask, attackingMask, setPieceMask, weakFoot, header, aerial, flair, trickster, engine, fox = masks
+        traitMask = self.traitMask
+        age, rating, traitCount, secondaryCount = self.age, self.rating, traitMask.bit_count(), len(self.secondaryPositions)
+        technical, attacking, setPiece = (traitMask & technicalMask).bit_count(), (traitMask & attackingMask).bit_count(), (traitMask & setPieceMask).bit_count()
+        attributes = self.attributes
+        pac, sho, pas, dri, dfn, phy = attributes
+        first, second = sorted(attributes, reverse = True)[:2]
+        difference = lambda attribute: attribute - (second if attribute == first else first)
         return {
             ### Age based
-            'young': 3 - (self.age - 16) ** 2 / 3,
-            'promising': 3 - (self.age - 18) ** 2 / 2,
-            'veteran': min(4, 1.5 ** (self.age - 33)),
+            'young': 3 - (age - 16) ** 2 / 3,
+            'promising': 3 - (age - 18) ** 2 / 2,
+            'veteran': min(4, 1.5 ** (age - 33)),
             ### Attribute based
-            'pacey': self.getDifferenceFromMax(self.pac) / 6 if self.pac >= 65 else 0,
-            'lethal': self.getDifferenceFromMax(self.sho) / 2 if self.sho >= 60 else 0,
-            'creative': self.getDifferenceFromMax(self.pas) / 2 if self.pas >= 60 else 0,
-            'skillful': self.getDifferenceFromMax(self.dri) / 3 if self.dri >= 60 else 0,
-            'tenacious': self.getDifferenceFromMax(self.dfn) / 3 if self.dfn >= 60 else 0,
-            'robust': self.getDifferenceFromMax(self.phy) / 4 if self.phy >= 65 else 0,
-            'elegant': (max(0, self.traitCategoryCount('Technical') * 3 + self.traitCategoryCount('Attacking') * 2 - len(self.traits)) ** 0.7) if self.rating > 80 else 0,
-            'unforgiving': (max(0, self.traitCategoryCount('Technical') * 2 + self.traitCategoryCount('Attacking') * 3 - len(self.traits)) ** 0.7) if self.rating > 80 else 0,
-            'complete': 100 / (10 + self.getDifferenceFromMax(min(self.attributes)) ** 2),
+            'pacey': difference(pac) / 6 if pac >= 65 else 0,
+            'lethal': difference(sho) / 2 if sho >= 60 else 0,
+            'creative': difference(pas) / 2 if pas >= 60 else 0,
+            'skillful': difference(dri) / 3 if dri >= 60 else 0,
+            'tenacious': difference(dfn) / 3 if dfn >= 60 else 0,
+            'robust': difference(phy) / 4 if phy >= 65 else 0,
+            'elegant': (max(0, technical * 3 + attacking * 2 - traitCount) ** 0.7) if rating > 80 else 0,
+            'unforgiving': (max(0, technical * 2 + attacking * 3 - traitCount) ** 0.7) if rating > 80 else 0,
+            'complete': 100 / (10 + difference(min(attributes)) ** 2),
             ### Quality based
             '!southpaw': 1.6 if self.foot == 'left' else 0,
-            'ambidextrous': 1.7 if self.hasTrait('Weak Foot') else 0,
-            'versatile': len(self.secondaryPositions) ** 2 / 8,
-            '!targetman': 1.6 + int(self.hasTrait('Header')) + max(0, self.getDifferenceFromMax(self.phy)) / 6 if self.position.ucShortName == 'ST' and self.hasTrait('Aerial') else 0,
-            'magical': 2.2 + max(0, self.getDifferenceFromMax(self.dri)) / 5 if self.hasTrait('Flair') and self.hasTrait('Trickster') and self.rating >= 75 else 0,
+            'ambidextrous': 1.7 if traitMask & weakFoot else 0,
+            'versatile': secondaryCount ** 2 / 8,
+            '!targetman': 1.6 + int(bool(traitMask & header)) + max(0, difference(phy)) / 6 if self.position.ucShortName == 'ST' and traitMask & aerial else 0,
+            'magical': 2.2 + max(0, difference(dri)) / 5 if traitMask & flair and traitMask & trickster and rating >= 75 else 0,
             ### Trait based
-            'tireless': self.getDifferenceFromMax(self.phy) / 3 if self.hasTrait('Engine') else 0,
-            'tricky': 2.2 if self.hasTrait('Fox') and self.traitCategoryCount('Set Piece') >= 2 else 0,
-            '!set piece specialist': self.traitCategoryCount('Set Piece') ** 1.5 / 1.8 if self.traitCategoryCount('Set Piece') >= 2 else 0,
-            'special': len(self.traits) ** 1.4 / 3.5 if len(self.traits) >= 5 else 0,
+            'tireless': difference(phy) / 3 if traitMask & engine else 0,
+            'tricky': 2.2 if traitMask & fox and setPiece >= 2 else 0,
+            '!set piece specialist': setPiece ** 1.5 / 1.8 if setPiece >= 2 else 0,
+            'special': traitCount ** 1.4 / 3.5 if traitCount >= 5 else 0,
             ### Rating based
-            '!superstar': self.rating / 9 if self.rating >= 93.5 else 0,
-            'exceptional': self.rating / 10 if self.rating >= 91.5 else 0,
-            'elite': max(0, self.rating - 70) ** 1.5 / 20 - .9,
-            'world class': max(0, self.rating - 70) ** 1.35 / 20,
-            'legendary': (max(0, self.rating - 70) ** 1.35 / 20) ** 2.8 * self.age ** 7 / 300_000_000_000,
-            'breakout': (max(0, self.rating - 70) / 10) ** 2.5 if self.age < 23 else 0,
-            '!wonderkid': (max(0, self.rating - 65) / 10) ** 2.5 if self.age < 20 else 0,
+            '!superstar': rating / 9 if rating >= 93.5 else 0,
+            'exceptional': rating / 10 if rating >= 91.5 else 0,
+            'elite': max(0, rating - 70) ** 1.5 / 20 - .9,
+            'world class': max(0, rating - 70) ** 1.35 / 20,
+            'legendary': (max(0, rating - 70) ** 1.35 / 20) ** 2.8 * age ** 7 / 300_000_000_000,
+            'breakout': (max(0, rating - 70) / 10) ** 2.5 if age < 23 else 0,
+            '!wonderkid': (max(0, rating - 65) / 10) ** 2.5 if age < 20 else 0,
             ### Misc
             self.nation.ucNationality: 1.5
         }
     
     @property
     def pureDescription(self) -> str:
-        return list(self.descriptionDict.keys())[list(self.descriptionDict.values()).index(sorted(self.descriptionDict.values(), reverse = True)[0])]
+        if self.descriptionCache is None:
+            scores = self.descriptionDict
+            self.descriptionCache = max(scores, key = scores.__getitem__)
+        return self.descriptionCache
+
+    @classmethod
+    def pureDescriptions(cls, players: Iterable[Player]) -> list[str]:
+        '''Returns `.pureDescription` of every player in `players`, for example a squad or the best players of a league. The trait masks are looked up once for the whole batch and only players whose state changed are scored again.'''
+        masks: tuple[int, ...] | None = None
+        descriptions: list[str] = []
+        for player in players:
+            if player.descriptionCache is None:
+                if masks is None:
+                    masks = cls.descriptionMasks()
+                scores = player.scoreDescriptions(masks)
+                player.descriptionCache = max(scores, key = scores.__getitem__)
+            descriptions.append(player.descriptionCache)
+        return descriptions
+
+    @classmethod
+    def descriptions(cls, players: list[Player]) -> list[str]:
+        '''Returns `.description` of every player in `players` (see `Player.pureDescriptions()`).'''
+        cls.pureDescriptions(players)
+        return [player.description for player in players]
 
     @property
     def ucDescription(self) -> str:
@@ -1614,28 +3064,43 @@ class Player(ColorText):
     
     @property
     def rating(self) -> int | float:
-        return self.getPositionScore(self.position)
+        return self.cacheRating() if self.ratingCache is None else self.ratingCache
     
     @property
     def irating(self) -> int:
-        return round(self.getPositionScore(self.position))
+        return round(self.rating)
     
     @property
     def ipotential(self) -> int:
         return round(self.potential)
 
-    def genSuit(self, targetPosition: Position) -> dict[Position, float]:
-        suit: dict[Position, float] = {currentPosition: Calc.suitValue(self.getPositionScore(targetPosition), self.getPositionScore(currentPosition)) for currentPosition in Position.instances}
-        mx: float = max(suit.values())
-        for p in Position.instances:
-            suit[p] -= mx
-        return suit
+    @property
+    def fullName(self) -> str:
+        return self.colorText(self.ucFullName)
+
+    @property
+    def shirtName(self) -> str:
+        return self.colorText(self.ucShirtName)
+
+    @property
+    def traits(self) -> list[Trait]:
+        return Trait.fromMask(self.traitMask)
+
+    @traits.setter
+    def traits(self, traits: Iterable[Trait]) -> None:
+        self.traitMask = Trait.maskOf(traits)
+
+    def genSuit(self, targetPosition: Position) -> array:
+        suit: list[float] = [Calc.suitValue(self.getPositionScore(targetPosition), self.getPositionScore(currentPosition)) for currentPosition in Position.instances]
+        mx: float = max(suit)
+        return array('d', [value - mx for value in suit])
 
     def getPositionScore(self, position: Position) -> float:
         '''Returns the overall of the player in the given position.'''
-        score: float = self.pac * position.weightings[0] + self.sho * position.weightings[1] + self.pas * position.weightings[2] + self.dri * position.weightings[3] + self.dfn * position.weightings[4] + self.phy * position.weightings[5] + (MAX_ATTRIBUTE_VALUE if self.foot == 'left' or self.hasTrait('Weak Foot') else 1) * position.weightings[6] + (MAX_ATTRIBUTE_VALUE if self.foot == 'right' or self.hasTrait('Weak Foot') else 1) * position.weightings[7] + position.modifier
+        weakFoot: bool = self.hasTrait('Weak Foot')
+        score: float = self.pac * position.weightings[0] + self.sho * position.weightings[1] + self.pas * position.weightings[2] + self.dri * position.weightings[3] + self.dfn * position.weightings[4] + self.phy * position.weightings[5] + (MAX_ATTRIBUTE_VALUE if self.foot == 'left' or weakFoot else 1) * position.weightings[6] + (MAX_ATTRIBUTE_VALUE if self.foot == 'right' or weakFoot else 1) * position.weightings[7] + position.modifier
         try:
-            return min(MAX_ATTRIBUTE_VALUE, score) + self.suit[position]
+            return min(MAX_ATTRIBUTE_VALUE, score) + self.suit[position.index]
         except AttributeError:
             return min(MAX_ATTRIBUTE_VALUE, score)
 
@@ -1644,14 +3109,16 @@ class Player(ColorText):
         Returns True if `targetTrait` is one of the traits of the player, False otherwise.
         `targetTrait` must be a Trait object or be in .searchOptions.
         '''
-        return (targetTrait in self.traits) or (Trait.find(targetTrait, True) in self.traits)
+        return bool(self.traitMask & Trait.bitOf(targetTrait))
     
     def traitCategoryCount(self, category: str) -> int:
-        category = uncolor(category)
-        if not category in Trait.categories:
+        if not category in Trait.categoryMasks:
+            category = uncolor(category)
+        if not category in Trait.categoryMasks:
             raise GameError(f'traitCategoryCount({category=}) called with category not in {Trait.categories = }.')
-        return sum([int(trait.ucCategory == category) for trait in self.traits])
+        return (self.traitMask & Trait.categoryMasks[category]).bit_count()
 
+    @buffered
     def viewProfile(self, end: bool = True) -> None:
         '''Shows the profile of the player. If `end` is True, forces the user to press Enter.'''
         # input('\n' + '\n'.join([str(i) + '. ' + pos.shortName + ' ' + str(self.getPositionScore(pos)) for i, pos in enumerate(self.positions, 1)]) + '\n')
@@ -1682,7 +3149,7 @@ class Player(ColorText):
 
     def getDifferenceFromMax(self, attribute: float) -> float:
         '''Returns the difference between `attribute` and the biggest attribute that is not `attribute` itself.'''
-        attributes: list[float] = self.attributes.copy()
+        attributes: list[float] = self.attributes
         attributes.remove(attribute)
         return attribute - max(attributes)
 
@@ -1700,11 +3167,14 @@ class Hero (Player):
         data['nation'] = Nation.find(data['nation'], True)
         data['traits'] = [trait if isinstance(trait, Trait) else Trait.instances[trait - 1] for trait in data['traits']]
         data['club'] = Club.find(data['club'], True) if data['club'] else None
-        self.__dict__ = data
-        super().__init__(None, None, None)
+        data['ucFullName'] = data.pop('fullName')
+        data['ucShirtName'] = data.pop('shirtName')
+        for attribute, value in data.items():
+            setattr(self, attribute, value)
+        super().__init__()
+        self.squad = 'U18'
+        self.potential = Calc.heroPotential()
         self.suit = self.genSuit(self.position)
-        self.ucFullName, self.fullName = [self.fullName, self.colorText(self.fullName)]
-        self.ucShirtName, self.shirtName = [self.shirtName, self.colorText(self.shirtName)]
 
     @classmethod
     def fromInputs(cls) -> Hero:
@@ -1785,10 +3255,12 @@ class Hero (Player):
                 print('<ured>This shirt name contains invalid characters.\nPlease pick a different one.</ured>')
                 continue
             while True:
-                nationSuggestion = input(f'<uyellow>Enter his nation\'s name or its 3 letter code{" (type the beginning, then use arrow keys)" if not setupFiles else ""}:</uyellow> ', completer = WordCompleter(nationNames, ignore_case = True)).lower()
+                nationSuggestion = input(f'<uyellow>Enter his nation\'s name or its 3 letter code{" (type the beginning, then use arrow keys)" if not setupFiles else ""}:</uyellow> ', completer = Search(['nation'])).lower()
                 if nationSuggestion == '/quit':
                     raise QuitError
                 data['nation'] = Nation.find(nationSuggestion)
+                if data['nation'] == -1 and len(nationMatches := Nation.findPrefix(nationSuggestion, 2)) == 1:
+                    data['nation'] = nationMatches[0]
                 if data['nation'] != -1:
                     break
                 print('\n<ured>Sorry, we couldn\'t find your nation. Please make sure that they are a member of FIFA.</ured>\n\n')
@@ -1829,6 +3301,7 @@ class Hero (Player):
                 break
             print('\n\n')
         
+        waitForWorld()
         data['club'] = academyMenu(data)
         
         try:
@@ -1845,17 +3318,22 @@ class Hero (Player):
 
     def toDict(self) -> dict:
         '''Returns itself as a dictionary that is ready to be used for saving.'''
-        data = {a: b for a, b in self.__dict__.items()}
-        data['nation'] = data['nation'].ucName
-        data['traits'] = [trait.ucNum for trait in data['traits']]
-        data['club'] = data['club'].ucName if data['club'] else None
-        data['fullName'] = data['ucFullName']
-        data['shirtName'] = data['ucShirtName']
-        data.pop('potential')
-        data.pop('ucFullName')
-        data.pop('ucShirtName')
-        data.pop('suit')
-        return data
+        return {
+            'fullName': self.ucFullName,
+            'shirtName': self.ucShirtName,
+            'nation': self.nation.ucName,
+            'pac': self.pac,
+            'sho': self.sho,
+            'pas': self.pas,
+            'dri': self.dri,
+            'dfn': self.dfn,
+            'phy': self.phy,
+            'foot': self.foot,
+            'traits': [trait.ucNum for trait in self.traits],
+            'club': self.club.ucName if self.club else None,
+            'age': self.age,
+            'squad': self.squad,
+        } | self.__dict__
     
     def colorText(self, text: str) -> str:
         '''Colors `text` in the color of the nation of the hero and underlines it.'''
@@ -1865,6 +3343,284 @@ class Hero (Player):
     def ipotential(self) -> str:
         return '??'
 
+class PlayerRankings:
+    '''
+    The class for top-k queries over players, like the best players in the world, of a nation, of a league, of a club or in a position.\n
+    For every mode and scope, players are kept in sorted lists, one for every group of the scope (for example, one for every nation).
+    A scope is sorted the first time it is queried. After that, only players that were created, moved or developed since the last query are put in their new places.\n
+    Attributes:
+    - `.modes`: A dictionary of functions that return the value players are ranked by, by mode.
+    - `.scopes`: A dictionary of functions that return the group of a player, by scope.
+    - `.groups`: A dictionary of sorted lists of entries by group, by mode and scope. Entries are `(-value, number, player)`.
+    - `.entries`: A dictionary of the group and the entry of every player, by mode and scope.
+    - `.numbers`: A dictionary of the index of every player in `Player.instances`. Players with equal values are ranked in this order.
+    - `.players`: The `Player.instances` list the rankings are built for.
+    - `.dirty`: A set of players that have to be put in their new places before the next query (see `Player.rankingAttributes`).
+    - `.lock`: The lock that is held during queries, as rankings are also read by the background thread of `RankingScreens`.
+    - `.dirtyLock`: The lock that is held while `.dirty` is added to or taken, so that no player is lost while a query is updating the rankings (see `.markDirty()`).
+    '''
+    modes: ClassVar[dict[str, Callable[[Player], float]]] = {
+        'rating': lambda player: player.rating,
+        'potential': lambda player: player.potential,
+    }
+    scopes: ClassVar[dict[str, Callable[[Player], Any]]] = {
+        'world': lambda player: None,
+        'nation': lambda player: player.nation,
+        'league': lambda player: getattr(getattr(player, 'club', None), 'league', None),
+        'club': lambda player: getattr(player, 'club', None),
+        'position': lambda player: player.position,
+    }
+
+    def __init__(self) -> None:
+        self.lock: RLock = RLock()
+        self.dirtyLock: Lock = Lock()
+        self.reset()
+
+    def reset(self) -> None:
+        '''Forgets all rankings. They are built again from `Player.instances` when they are queried.'''
+        self.groups: dict[tuple[str, str], dict[Any, list[tuple[float, int, Player]]]] = {}
+        self.entries: dict[tuple[str, str], dict[Player, tuple[Any, tuple[float, int, Player]]]] = {}
+        self.numbers: dict[Player, int] = {}
+        self.players: list[Player] = Player.instances
+        self.dirty: set[Player] = set()
+
+    def top(self, k: int, mode: str = 'rating', scope: str = 'world', group: Any = None, start: int = 0) -> list[Player]:
+        '''
+        Returns the best `k` players of `group` in `scope` sorted by `mode` in descending order, skipping the first `start` of them.\n
+        For example, `rankings.top(10, 'potential', 'league', league)` returns the 10 players of `league` with the highest potential.
+        '''
+        genPendingSquads()
+        with self.lock:
+            self.update()
+            if (mode, scope) not in self.groups:
+                self.build(mode, scope)
+            return [entry[2] for entry in self.groups[mode, scope].get(group, [])[start:start + k]]
+
+    def build(self, mode: str, scope: str) -> None:
+        '''
+        Sorts all players that have a number by `mode` in every group of `scope`.
+        Players made by another thread since the last `.update()` are left for the next one, as they are appended to `.players` while it is being read.
+        '''
+        value, groupOf = self.modes[mode], self.scopes[scope]
+        groups: dict[Any, list[tuple[float, int, Player]]] = {}
+        entries: dict[Player, tuple[Any, tuple[float, int, Player]]] = {}
+        for player in self.players[:len(self.numbers)]:
+            group, entry = groupOf(player), (-value(player), self.numbers[player], player)
+            groups.setdefault(group, []).append(entry)
+            entries[player] = (group, entry)
+        for groupEntries in groups.values():
+            groupEntries.sort()
+        self.groups[mode, scope] = groups
+        self.entries[mode, scope] = entries
+
+    def markDirty(self, player: Player) -> None:
+        '''Adds `player` to `.dirty`. Unlike `.lock`, `.dirtyLock` is never held for long, so players can change while rankings are being built.'''
+        with self.dirtyLock:
+            self.dirty.add(player)
+
+    def update(self) -> None:
+        '''Puts new players and players from `.dirty` in their places in all rankings that were built. `.dirty` is swapped for an empty set first.'''
+        if self.players is not Player.instances:
+            self.reset()
+        with self.dirtyLock:
+            dirty, self.dirty = self.dirty, set()
+        newPlayers = self.players[len(self.numbers):]
+        for player in newPlayers:
+            self.numbers[player] = len(self.numbers)
+        if self.groups:
+            for player in dirty.union(newPlayers):
+                for (mode, scope), entries in self.entries.items():
+                    groups = self.groups[mode, scope]
+                    if player in entries:
+                        group, entry = entries[player]
+                        del groups[group][bisect_left(groups[group], entry)]
+                    group, entry = self.scopes[scope](player), (-self.modes[mode](player), self.numbers[player], player)
+                    insort(groups.setdefault(group, []), entry)
+                    entries[player] = (group, entry)
+
+class Search(Completer):
+    '''
+    The class for searching players, clubs, leagues and nations by name while the user types. Instances are prompt_toolkit completers.\n
+    All instances share one index. Every search option of every object of the kinds that were searched for is an entry, for players it is their full name.
+    The objects of the kinds of an instance are indexed when it is made, so that typing does not wait for the index, and completions are made in a thread (see `input()`).
+    Entries are found by the trigrams they share with the query (`' ' + query`, so that the beginning of a word counts too) and by their beginnings for short queries.\n
+    Attributes:
+    - `.kinds`: A tuple of kinds of objects the instance completes, out of `Search.sources`.
+    - `.limit`: The maximum number of completions.
+    - `.kindMask`: A boolean array of the entries of `.kinds`, or None if it has to be made again for a changed index.
+    - `.sources`: A dictionary of functions that return the objects of every kind.
+    - `.texts`: A list of the lowercase texts of all entries.
+    - `.objects`: A list of the objects of all entries.
+    - `.kindNumbers`: An array of the number of the kind (in `Search.sources`) of every entry.
+    - `.textLengths`: An array of the lengths of the texts of all entries.
+    - `.trigrams`: A dictionary of the entry numbers that contain a trigram, by trigram.
+    - `.prefixIndex`: A sorted list of `(text, number)` pairs of all entries.
+    - `.indexed`: A dictionary of the `instances` list of every kind that the index was built for, and how many objects were indexed from it, by kind.
+    - `.lock`: The lock that the index is updated and searched with, as completions are made in another thread.
+    '''
+    sources: ClassVar[dict[str, Callable[[], list[Any]]]] = {
+        'player': lambda: Player.instances,
+        'club': lambda: Club.instances,
+        'league': lambda: League.instances,
+        'nation': lambda: Nation.instances,
+    }
+    texts: ClassVar[list[str]] = []
+    objects: ClassVar[list[Any]] = []
+    kindNumbers: ClassVar[array] = array('b')
+    textLengths: ClassVar[array] = array('h')
+    trigrams: ClassVar[dict[str, array]] = {}
+    prefixIndex: ClassVar[list[tuple[str, int]]] = []
+    indexed: ClassVar[dict[str, tuple[list[Any], int]]] = {}
+    lock: ClassVar[RLock] = RLock()
+
+    def __init__(self, kinds: Iterable[str] = ('player', 'club', 'league', 'nation'), limit: int = SEARCH_LIMIT) -> None:
+        '''
+        Arguments:
+        - `kinds`: Kinds of objects to complete, out of `Search.sources`.
+        - `limit`: The maximum number of completions.
+        '''
+        self.kinds: tuple[str, ...] = tuple(kinds)
+        self.limit: int = limit
+        self.kindMask: np.ndarray | None = None
+        Search.updateIndex(self.kinds)
+
+    @staticmethod
+    def searchTexts(obj: Any) -> list[str]:
+        '''Returns the lowercase texts that `obj` can be found by.'''
+        return [obj.ucFullName.lower()] if isinstance(obj, Player) else obj.searchOptions
+
+    @staticmethod
+    def displayText(obj: Any) -> str:
+        '''Returns the uncolored name of `obj` that is shown in completions.'''
+        return obj.ucFullName if isinstance(obj, Player) else obj.ucName
+
+    @classmethod
+    def updateIndex(cls, kinds: Iterable[str]) -> None:
+        '''Adds new objects of `kinds` to the index. The index is built again if an indexed `instances` list was replaced or if objects were removed from it.'''
+        with cls.lock:
+            if any(cls.sources[kind]() is not instances or len(instances) < count for kind, (instances, count) in cls.indexed.items()):
+                cls.texts, cls.objects, cls.kindNumbers, cls.textLengths, cls.trigrams, cls.prefixIndex = [], [], array('b'), array('h'), {}, []
+                cls.indexed = {}
+            newEntries: list[tuple[str, int]] = []
+            for kind in kinds:
+                instances, count = cls.indexed.get(kind, (cls.sources[kind](), 0))
+                kindNumber = list(cls.sources).index(kind)
+                for obj in instances[count:]:
+                    for text in cls.searchTexts(obj):
+                        number = len(cls.texts)
+                        cls.texts.append(text)
+                        cls.objects.append(obj)
+                        cls.kindNumbers.append(kindNumber)
+                        cls.textLengths.append(min(len(text), 255))
+                        newEntries.append((text, number))
+                        paddedText = f' {text} '
+                        for trigram in {paddedText[i:i + 3] for i in range(len(paddedText) - 2)}:
+                            if trigram not in cls.trigrams:
+                                cls.trigrams[trigram] = array('i')
+                            cls.trigrams[trigram].append(number)
+                cls.indexed[kind] = (instances, len(instances))
+            if newEntries:
+                if len(newEntries) < len(cls.prefixIndex):
+                    for entry in newEntries:
+                        insort(cls.prefixIndex, entry)
+                else:
+                    cls.prefixIndex = sorted(cls.prefixIndex + newEntries)
+
+    def find(self, query: str) -> list[Any]:
+        '''
+        Returns up to `.limit` objects that match `query` best, without repeats.\n
+        Entries that start with the query come first, then entries that have a word starting with it, then the rest by the number of trigrams they share with it.
+        Shorter entries win ties.
+        '''
+        with Search.lock:
+            Search.updateIndex(self.kinds)
+            query = ' '.join(query.lower().split())
+            if not query:
+                return []
+            if self.kindMask is None or len(self.kindMask) != len(Search.texts):
+                self.kindMask = np.isin(np.frombuffer(Search.kindNumbers, np.int8), [list(Search.sources).index(kind) for kind in self.kinds])
+            kindMask = self.kindMask
+            candidates: list[int] = []
+            for text, number in islice(Search.prefixIndex, bisect_left(Search.prefixIndex, (query,)), None):
+                if not text.startswith(query) or len(candidates) == self.limit * 4:
+                    break
+                if kindMask[number]:
+                    candidates.append(number)
+            paddedQuery = f' {query}'
+            postings = [np.frombuffer(Search.trigrams[trigram], np.int32) for trigram in {paddedQuery[i:i + 3] for i in range(len(paddedQuery) - 2)} if trigram in Search.trigrams]
+            if postings:
+                scores = np.bincount(np.concatenate(postings), minlength=len(Search.texts)) * kindMask
+                best = np.argpartition(scores * 256 - np.frombuffer(Search.textLengths, np.int16), -min(len(scores), self.limit * 4))[-self.limit * 4:]
+                candidates += [int(number) for number in best if scores[number]]
+                sharedTrigrams = scores.__getitem__
+            else:
+                sharedTrigrams = lambda number: 0
+            found: dict[int, Any] = {}
+            for number in sorted(set(candidates), key=lambda number: (not Search.texts[number].startswith(query), not f' {query}' in f' {Search.texts[number]}', -sharedTrigrams(number), len(Search.texts[number]), number)):
+                found.setdefault(id(Search.objects[number]), Search.objects[number])
+                if len(found) == self.limit:
+                    break
+            return list(found.values())
+
+    def get_completions(self, document: Document, complete_event: CompleteEvent) -> Iterable[Completion]:
+        '''Yields the results of `.find()` for the text before the cursor as prompt_toolkit completions.'''
+        text = document.text_before_cursor
+        for obj in self.find(text):
+            yield Completion(self.displayText(obj), -len(text), display_meta=type(obj).__name__ + (f' ({obj.nation.ucShortName})' if hasattr(obj, 'nation') and obj.nation else ''))
+
+class Roster(list):
+    '''
+    The class for the players of a club.\n
+    Works exactly like a list, but clears the cached rating of the club (see `Club.clearRating()`) whenever players are added or removed.\n
+    Attributes:
+    - `.club`: The club the roster belongs to.
+    '''
+    def __init__(self, club: Club, players: Iterable[Player] = ()) -> None:
+        '''
+        Arguments:
+        - `club`: The club the roster belongs to.
+        - `players`: The players in the roster.
+        '''
+        super().__init__(players)
+        self.club: Club = club
+
+    def append(self, player: Player) -> None:
+        super().append(player)
+        self.club.clearRating()
+
+    def extend(self, players: Iterable[Player]) -> None:
+        super().extend(players)
+        self.club.clearRating()
+
+    def insert(self, i: int, player: Player) -> None:
+        super().insert(i, player)
+        self.club.clearRating()
+
+    def remove(self, player: Player) -> None:
+        super().remove(player)
+        self.club.clearRating()
+
+    def pop(self, i: int = -1) -> Player:
+        player = super().pop(i)
+        self.club.clearRating()
+        return player
+
+    def clear(self) -> None:
+        super().clear()
+        self.club.clearRating()
+
+    def __setitem__(self, i: Any, value: Any) -> None:
+        super().__setitem__(i, value)
+        self.club.clearRating()
+
+    def __delitem__(self, i: Any) -> None:
+        super().__delitem__(i)
+        self.club.clearRating()
+
+    def __iadd__(self, players: Iterable[Player]) -> Roster:
+        self.extend(players)
+        return self
+
 class Club(Find):
     '''
     The class for a club.\n
@@ -1879,10 +3635,15 @@ class Club(Find):
     - `.nationalTeam`: Contains True if the club is a national team, False otherwise.
     - `.uc{Attribute}`: Same as `.{attribute}` but contains uncolored text instead of colored.
     - `.i{attribute}`: Same as `.{attribute}` but is of type `int` instead of `float`.
-    - `.players`: A list of all players currently at the club.
+    - `.players`: A Roster of all players currently at the club.
+    - `.ratingCache`: The cached `.rating`, or None if it has to be calculated again. Cleared when the roster or the rating of one of its players changes.
+    - `.squadJob`: A function that generates `.players` on first access in a lazy world (see `createLeagues()`), or None if they are generated already.
+    Until then, `.rating` of a club is approximated by its rating from the database.
     - `.instances`: A list of all Club instances except national teams and the free agents club.
+    - `.academySamplers`: A dictionary of cached academy offer samplers by the nation of the hero. See `Club.academySampler()`.
     '''
     instances: ClassVar[list[Club]] = []
+    academySamplers: ClassVar[dict[Nation, WeightedSampler]] = {}
     def __init__(self, ovr: float, fullName: str, names: list[str], nickname: str, shortName: str, colors: list[str], nationalTeam: bool = False):
         '''
         Arguments:
@@ -1906,6 +3667,7 @@ class Club(Find):
         self.shortName: str = self.colorText(shortName)
         self.ucShortName: str = shortName
         self.nationalTeam: bool = nationalTeam
+        self.squadJob: Callable[[], Any] | None = None
         self.players: list[Player] = []
         try:
             if self is freeAgents or self.nationalTeam:
@@ -1915,14 +3677,57 @@ class Club(Find):
         self.searchOptions: list[str] = [self.ucFullName.lower(), self.ucNickname.lower(), self.ucShortName.lower()] + [clubName.lower() for clubName in self.ucNames]
         Club.instances.append(self)
     
+    @property
+    def players(self) -> Roster:
+        self.genSquad()
+        return self.roster
+
+    @players.setter
+    def players(self, players: Iterable[Player]) -> None:
+        self.roster = Roster(self, players)
+        self.clearRating()
+
+    def genSquad(self) -> None:
+        '''Runs `.squadJob` if the players of the club aren't generated yet.'''
+        if self.squadJob is not None:
+            squadJob, self.squadJob = self.squadJob, None
+            squadJob()
+
+    def setSquad(self, records: list[tuple], freeAgentI: int | None) -> None:
+        '''
+        Creates the players of the club from `records` (see `genSquadRecords()`).\n
+        If `freeAgentI` is not None, the `freeAgentI`th best player by rating after the best 11 leaves the club as a free agent.
+        '''
+        self.players = [Player.fromRecord(record) for record in records]
+        for player in self.players:
+            player.club = self
+        if freeAgentI is not None:
+            freeAgent: Player = sorted(self.players, key=lambda x: x.rating, reverse=True)[11:][freeAgentI]
+            self.players.remove(freeAgent)
+            freeAgent.club: Club = freeAgents
+            freeAgents.roster.append(freeAgent)
+            freeAgents.nation.playerList.append(freeAgent)
+
     @property
     def rating(self) -> float:
-        return sum(map(lambda x: x.rating, sorted(self.players, key=lambda x: x.rating, reverse=True)[:11])) / 11
+        if self.ratingCache is None:
+            if self.squadJob is not None and not self.nationalTeam:
+                return self.origRating
+            self.ratingCache = sum(nlargest(11, [player.rating for player in self.players])) / 11
+        return self.ratingCache
+
+    def clearRating(self) -> None:
+        '''Clears the cached rating of the club and the cached ratings of its league.'''
+        self.ratingCache = None
+        RankingScreens.invalidate()
+        if 'league' in self.__dict__:
+            self.league.clearRatings()
     
     @property
     def irating(self) -> int:
         return round(self.rating)
     
+    @buffered
     def viewProfile(self, caption: str = '<uyellow>Press Enter to go back to the start menu: </uyellow>', end: bool = True) -> None:
         '''Shows the profile of the club.'''
         clear()
@@ -1934,7 +3739,8 @@ class Club(Find):
 <bold>Colors:</bold>          {self.colorText('   ', True)}{self.color2Text('   ', True)}.
 <bold>League:</bold>          {self.league.name}.\
 {f'\n<uorange>Rating:          {round(self.rating, 2)}</uorange>.' if DEV_MODE else ''}''')
-        t = Table([[i, p.position.shortName, p.nation.name, p.fullName, *p.iattributes, p.iage, p.irating, p.ipotential] for i, p in enumerate(sorted(self.players, key=lambda x: x.rating, reverse=True), 1)], ['№', 'Pos', 'Nation', 'Full name', Header('Pac', columnColor='uyellow'), Header('Sho', columnColor='ured'), Header('Pas', columnColor='ucyan'), Header('Dri', columnColor='umagenta'), Header('Dfn', columnColor='ugreen'), Header('Phy', columnColor='uwhite'), Header('Age', columnColor='lbrown'), Header('OVR', columnColor='uwhite'), Header('POT', columnColor='dgreen')], f"<bold>{self.fullName}'s senior squad:</bold>", caption if end else None)
+        players = sorted(self.players, key=lambda x: x.rating, reverse=True)
+        t = Table([[i, p.position.shortName, p.nation.name, p.fullName, *p.iattributes, p.iage, p.irating, p.ipotential, description] for i, (p, description) in enumerate(zip(players, Player.descriptions(players)), 1)], ['№', 'Pos', 'Nation', 'Full name', Header('Pac', columnColor='uyellow'), Header('Sho', columnColor='ured'), Header('Pas', columnColor='ucyan'), Header('Dri', columnColor='umagenta'), Header('Dfn', columnColor='ugreen'), Header('Phy', columnColor='uwhite'), Header('Age', columnColor='lbrown'), Header('OVR', columnColor='uwhite'), Header('POT', columnColor='dgreen'), 'Description'], f"<bold>{self.fullName}'s senior squad:</bold>", caption if end else None)
         t.print(end)
         clear()
 
@@ -1955,6 +3761,13 @@ class Club(Find):
     def colorFullText(self, text: str) -> str:
         '''Colors the `text` with the first color of the club and colors the background with the second color of the club.'''
         return self.color2Text(self.colorText(text), True)
+
+    @classmethod
+    def academySampler(cls, heroNation: Nation) -> WeightedSampler:
+        '''Returns a WeightedSampler of clubs that offer a place in their academy to a hero from `heroNation`. Samplers are cached until the clubs change.'''
+        if heroNation not in cls.academySamplers:
+            cls.academySamplers[heroNation] = WeightedSampler(cls.instances, [Calc.academyOfferClubWeight(i, club.nation is heroNation) for i, club in enumerate(cls.instances)])
+        return cls.academySamplers[heroNation]
     
 class League(Find):
     '''
@@ -1968,18 +3781,22 @@ class League(Find):
     - `.sortedClubs`: Same as `.clubs` but sorted by their rating in descending order.
     - `.capacity`: How many clubs participate in the league.
     - `.rating`: Shortcut for `.getRating()`.
+    - `.ratingCache`: A dictionary of the cached ratings of the league by mode (see `.getRating()`). Cleared when the rating of one of the clubs changes.
+    - `.sortedClubsCache`: The cached `.sortedClubs`, or None if the clubs have to be sorted again.
     - `.instances`: A list of all League instances except the free agents one.
     '''
     instances: ClassVar[list[League]] = []
     
-    def __init__(self, name: str, nation: Nation, clubs: list[Club]) -> None:
+    def __init__(self, name: str, nation: Nation, clubs: list[Club], register: bool = True) -> None:
         '''
         Arguments:
         - `name`: The name of the league.
         - `nation`: The nation the league corresponds to.
         - `clubs`: A list of all clubs that participate in the league.
+        - `register`: If False, the league is not added to `League.instances`. Used for the league of free agents.
         '''
-        League.instances.append(self)
+        if register:
+            League.instances.append(self)
         self.nation: Nation = nation
         self.nation.leagues.append(self)
         self.level: int = len(self.nation.leagues)
@@ -1988,6 +3805,7 @@ class League(Find):
         self.ucName: str = name
         self.name: str = self.colorText(self.ucName)
         self.clubs: list[Club] = clubs
+        self.clearRatings()
         for club in clubs:
             club.league = self
             club.nation = self.nation
@@ -2011,18 +3829,109 @@ class League(Find):
         - 'top': Calculates the average of the ratings of the clubs in the top half of the league (sorted by their rating).
         - 'median': Calculates the median rating of all of the clubs in the league.
         '''
-        match mode:
-            case 'average':
-                return round(sum([club.rating for club in self.clubs]) / self.capacity, 2)
-            case 'top':
-                return round(sum([club.rating for club in self.clubs[:self.capacity // 2]]) / (self.capacity // 2), 2)
-            case 'median':
-                return round((self.sortedClubs[self.capacity // 2].rating + self.sortedClubs[(self.capacity - 1) // 2].rating) / 2, 2)
+        if mode not in self.ratingCache:
+            match mode:
+                case 'average':
+                    self.ratingCache[mode] = round(sum([club.rating for club in self.clubs]) / self.capacity, 2)
+                case 'top':
+                    self.ratingCache[mode] = round(sum([club.rating for club in self.clubs[:self.capacity // 2]]) / (self.capacity // 2), 2)
+                case 'median':
+                    self.ratingCache[mode] = round((self.sortedClubs[self.capacity // 2].rating + self.sortedClubs[(self.capacity - 1) // 2].rating) / 2, 2)
+                case _:
+                    return None
+        return self.ratingCache[mode]
     
     @property
     def sortedClubs(self) -> list[Club]:
-        return sorted(self.clubs, key = lambda x: x.rating, reverse=True)
+        if self.sortedClubsCache is None:
+            self.sortedClubsCache = sorted(self.clubs, key = lambda x: x.rating, reverse=True)
+        return self.sortedClubsCache.copy()
+
+    def clearRatings(self) -> None:
+        '''Clears all cached ratings of the league and the order of its clubs.'''
+        self.ratingCache: dict[str, float] = {}
+        self.sortedClubsCache: list[Club] | None = None
     
+class World:
+    '''
+    The headless core of the game. Makes a world from the database and gives access to it without any menus or prompts, so that scripts, benchmarks and batch tools can use the game.\n
+    All objects of the game live in the `instances` lists of their classes, so there is one world at a time: generating or loading a world replaces the previous one.\n
+    Attributes:
+    - `.outputs`: A dictionary of the outputs of the load steps (see `loadSteps`) by name.
+    - `.settings`: The Settings object.
+    - `.style`: The style dictionary of the game (see `createStyle()`).
+    - `.players`, `.clubs`, `.leagues`, `.nations`: Shortcuts for the `instances` lists of the classes.
+    - `.freeAgents`: The club of the free agents.
+    '''
+    def __init__(self, database: str | None = None, interactive: bool = False) -> None:
+        '''
+        Loads the settings, the style, nations, positions and traits and makes them the ones the game uses (`settings`, `mainStyleDict` and `mainStyle`).
+        Leagues, clubs and players are made by `.generate()` or `.load()`.\n
+        Arguments:
+        - `database`: The database directory, or None for the one of the game (see `setDatabaseDirectory()`).
+        - `interactive`: If True, shows progress bars (if they are turned on in the settings) and reports database errors to the user before exiting (see `parseDatabase()`).
+        Otherwise, raises a DatabaseError with all errors.
+        '''
+        global settings, mainStyleDict, mainStyle
+        if database is not None:
+            setDatabaseDirectory(database)
+        pathsToCheck = list(files.values()) + list(dirs.values())
+        if interactive:
+            self.outputs: dict[str, Any] = parseDatabase(pathsToCheck, loadSteps)
+        else:
+            errorList: list[str] = []
+            self.outputs: dict[str, Any] = runLoadSteps(pathsToCheck, loadSteps, errorList)
+            if errorList:
+                raise DatabaseError('\n'.join(errorList))
+        settings = self.settings = self.outputs['settings']
+        mainStyleDict = self.style = self.outputs['style']
+        mainStyle = Style.from_dict(mainStyleDict)
+
+    def generate(self, seed: int | None = None, workers: int | None = None, lazy: bool = False, save: bool = False) -> None:
+        '''Generates a new world from `seed` in `workers` processes, lazily if `lazy` is True, and saves it if `save` is True (see `createLeagues()`).'''
+        createNations()
+        createLeagues(newWorld = True, workers = workers, lazy = lazy, seed = seed, save = save)
+
+    def load(self) -> None:
+        '''Restores the saved world, or generates and saves a new one if there is no valid saved world (see `createLeagues()`).'''
+        createNations()
+        createLeagues(lazy = False)
+
+    def save(self, filePath: str = WORLD_FILE) -> bool:
+        '''Saves the world to `filePath`, generating the rest of it first if it is lazy (see `saveWorld()`). Returns True if saving was successful or False otherwise.'''
+        genPendingSquads()
+        return saveWorld(filePath)
+
+    def top(self, k: int = 10, mode: str = 'rating', scope: str = 'world', group: Any = None, start: int = 0) -> list[Player]:
+        '''Returns the best `k` players of `group` in `scope` by `mode`, skipping the first `start` of them (see `PlayerRankings.top()`).'''
+        return rankings.top(k, mode, scope, group, start)
+
+    def search(self, query: str, kinds: Iterable[str] = ('player', 'club', 'league', 'nation'), limit: int = SEARCH_LIMIT) -> list[Any]:
+        '''Returns up to `limit` objects of `kinds` that match `query` best (see `Search.find()`).'''
+        genPendingSquads()
+        return Search(kinds, limit).find(query)
+
+    @property
+    def players(self) -> list[Player]:
+        genPendingSquads()
+        return Player.instances
+
+    @property
+    def clubs(self) -> list[Club]:
+        return Club.instances
+
+    @property
+    def leagues(self) -> list[League]:
+        return League.instances
+
+    @property
+    def nations(self) -> list[Nation]:
+        return Nation.instances
+
+    @property
+    def freeAgents(self) -> Club:
+        return freeAgents
+
 ### Preset variables and preparation code
 
 colorText: Callable[[str, str], str] = lambda text, color: ColorText().colorText(text, color)
@@ -2038,129 +3947,167 @@ preferredFoot, PreferredFoot = colorDoubleText('preferred foot', 'uorange')
 attributes = [pace, shooting, passing, dribbling, defending, physicality]
 Attributes = [Pace, Shooting, Passing, Dribbling, Defending, Physicality]
 
-just_fix_windows_console()
-chdir(dirname(abspath(__file__)))
-
-### Game loop
+rankings = PlayerRankings()
+
+loadSteps = [
+    LoadStep('settings', Settings, ['settings']),
+    LoadStep('style', createStyle, ['style']),
+    LoadStep('nations', createNations, ['nations', 'names'], progressValue = 10),
+    LoadStep('positions', createPositions, ['positions']),
+    LoadStep('traits', createTraits, ['traits']),
+]
+worldSteps = [
+    LoadStep('leagues', createLeagues, ['leagues', 'frames'], ['nations', 'positions', 'traits'], 5),
+]
+
+if __name__ == '__main__':
+    just_fix_windows_console()
+    chdir(dirname(abspath(__file__)))
+
+    if not checkArguments():
+        fullExit(2)
+    if '--generate-database' in argv:
+        generateDatabase(argv[argv.index('--generate-database') + 1], numberArgument('--scale') if '--scale' in argv else 1, requestedSeed() or 0)
+        fullExit()
+    if '--database' in argv:
+        setDatabaseDirectory(argv[argv.index('--database') + 1])
+    if '--benchmark-startup' in argv:
+        benchmarkStartup()
+        fullExit()
+    if '--benchmark-world' in argv:
+        benchmarkWorld()
+        fullExit()
+    if '--benchmark-memory' in argv:
+        benchmarkMemory()
+        fullExit()
+    if '--benchmark' in argv:
+        fullExit(1 if benchmarkSuite(numberArgument('--repeats') if '--repeats' in argv else BENCHMARK_REPEATS, '--save-baseline' in argv) else 0)
+
+    ### Game loop
 
-while True:
-    settings, mainStyleDict = parseDatabase(list(files.values()) + list(dirs.values()), [Settings, createStyle, createNations, createPositions, createTraits, createLeagues], [files['settings'], files['style'], ], [2, 2, 10, 2, 2, 5])
-    mainStyle = Style.from_dict(mainStyleDict)
-    
-    nationNames = [str(nation.fifaRanking) for nation in Nation.instances]
-    for nation in Nation.instances:
-        nationNames += nation.ucNames
-    nationNames += [nation.ucShortName for nation in Nation.instances]
+    while True:
+        world = World(interactive = True)
+        worldLoader = BackgroundLoader(worldSteps, world.outputs)
     
-    ### Testing
-
-    # nation_counts = {n.ucName: 0 for n in Nation.instances}
-    # for player in Player.instances:
-    #     if hasattr(player, 'nation') and not (player.club.league.nation is player.nation):
-    #         nation_counts[player.nation.ucName] += 1
-    # sorted_nations = sorted(Nation.instances, key=lambda n: n.fifaRanking)
-    # names = [n.ucName for n in sorted_nations if n.fifaRanking > 0]  # Exclude "Free agents" (-1)
-    # counts = [nation_counts[name] for name in names]
-    # fig, ax = plt.subplots(figsize=(20, 6))
-    # ax.bar(range(len(names)), counts, color='steelblue', edgecolor='none')
-    # ax.set_xlabel('Nation (sorted by FIFA Ranking)', fontsize=12)
-    # ax.set_ylabel('Number of Players', fontsize=12)
-    # ax.set_title('Player Distribution by Nation', fontsize=14)
-    # N = 1
-    # ax.set_xticks(range(0, len(names), N))
-    # ax.set_xticklabels([names[i] for i in range(0, len(names), N)], rotation=45, ha='right', fontsize=8)
-    # ax.yaxis.grid(True, linestyle='--', alpha=0.7)
-    # ax.set_axisbelow(True)
-    # plt.tight_layout()
-    # plt.show()
-
-    # viewPlayerRankings('rating')
-    # viewPlayerRankings('potential')
-
-    # for club in sorted(Club.instances, key=lambda x: x.rating + random() * 10, reverse=True):
-    #     club.viewProfile()
-
-    # freeAgents.nation.viewProfile()
+        ### Testing
+
+        # nation_counts = {n.ucName: 0 for n in Nation.instances}
+        # for player in Player.instances:
+        #     if hasattr(player, 'nation') and not (player.club.league.nation is player.nation):
+        #         nation_counts[player.nation.ucName] += 1
+        # sorted_nations = sorted(Nation.instances, key=lambda n: n.fifaRanking)
+        # names = [n.ucName for n in sorted_nations if n.fifaRanking > 0]  # Exclude "Free agents" (-1)
+        # counts = [nation_counts[name] for name in names]
+        # fig, ax = plt.subplots(figsize=(20, 6))
+        # ax.bar(range(len(names)), counts, color='steelblue', edgecolor='none')
+        # ax.set_xlabel('Nation (sorted by FIFA Ranking)', fontsize=12)
+        # ax.set_ylabel('Number of Players', fontsize=12)
+        # ax.set_title('Player Distribution by Nation', fontsize=14)
+        # N = 1
+        # ax.set_xticks(range(0, len(names), N))
+        # ax.set_xticklabels([names[i] for i in range(0, len(names), N)], rotation=45, ha='right', fontsize=8)
+        # ax.yaxis.grid(True, linestyle='--', alpha=0.7)
+        # ax.set_axisbelow(True)
+        # plt.tight_layout()
+        # plt.show()
+
+        # viewPlayerRankings('rating')
+        # viewPlayerRankings('potential')
+
+        # for club in sorted(Club.instances, key=lambda x: x.rating + random() * 10, reverse=True):
+        #     club.viewProfile()
+
+        # freeAgents.nation.viewProfile()
     
-    # for nation in sorted(Nation.instances, key=lambda x: x.rating + random() * 100, reverse=True):
-    #     nation.viewProfile()
+        # for nation in sorted(Nation.instances, key=lambda x: x.rating + random() * 100, reverse=True):
+        #     nation.viewProfile()
 
-    # input(pprint(Counter([list(self.descriptionDict.keys())[list(self.descriptionDict.values()).index(sorted(self.descriptionDict.values(), reverse = True)[0])] for self in Player.instances])))
+        # input(pprint(Counter([list(self.descriptionDict.keys())[list(self.descriptionDict.values()).index(sorted(self.descriptionDict.values(), reverse = True)[0])] for self in Player.instances])))
     
-    # for player in sorted(Player.instances, key=lambda x: x.descriptionDict[x.pureDescription] + 100 * bool(x.pureDescription in ['!wonderkid']), reverse=True):
-    #     player.viewProfile()
+        # for player in sorted(Player.instances, key=lambda x: x.descriptionDict[x.pureDescription] + 100 * bool(x.pureDescription in ['!wonderkid']), reverse=True):
+        #     player.viewProfile()
     
-    # cnt = {p.name: 0 for p in Position.instances}
-    # for pl in Player.instances:
-    #     cnt[pl.position.name] += 1
-    # for k, v in zip(cnt.keys(), cnt.values()):
-    #     cnt[k] = [v, f'{round(v / len(Player.instances) * 100, 2)}%', v / len(Player.instances) * 11]
-    # input(cnt)
+        # cnt = {p.name: 0 for p in Position.instances}
+        # for pl in Player.instances:
+        #     cnt[pl.position.name] += 1
+        # for k, v in zip(cnt.keys(), cnt.values()):
+        #     cnt[k] = [v, f'{round(v / len(Player.instances) * 100, 2)}%', v / len(Player.instances) * 11]
+        # input(cnt)
 
-    ### Inner game loop
+        ### Inner game loop
 
-    while True:
-        setupFiles = getFiles(dirs['setups'])
-        saveFiles = getFiles(dirs['saves'])
-        try:
-            match startingMenu():
-                case 'quit':
-                    if yesNoMenu('Are you sure you want to quit?', default = 'No'):
-                        clear()
-                        print('<uorange>Bye then... Hope to see you soon!</uorange>')
-                        sleep(2)
-                        fullExit()
-                    continue
-                case 'load-game':
-                    notReadyWarning()
-                    continue
-                case 'load-setup':
-                    hero = loadSetup()
-                    if not hero:
+        while True:
+            setupFiles = getFiles(dirs['setups'])
+            saveFiles = getFiles(dirs['saves'])
+            try:
+                match startingMenu():
+                    case 'quit':
+                        if yesNoMenu('Are you sure you want to quit?', default = 'No'):
+                            clear()
+                            print('<uorange>Bye then... Hope to see you soon!</uorange>')
+                            sleep(2)
+                            fullExit()
                         continue
-                case 'new-hero':
-                    if setupFiles and not yesNoMenu('Are you sure you want to create a new hero?', default = 'No'):
+                    case 'load-game':
+                        notReadyWarning()
                         continue
-                    hero = Hero.fromInputs()
-                    saveSetup(hero)
-                case 'settings':
-                    settings.edit()
-                    continue
-                case 'rankings':
-                    entered = True
-                    while entered:
-                        result = rankingsMenu()
-                        match result:
-                            case 'nations':
-                                while True:
-                                    result = nationRankingsMenu()
-                                    if result == 'quit':
-                                        entered = False
-                                        break
-                                    viewNationRankings(result)
-                            case 'leagues':
-                                while True:
-                                    result = leagueRankingsMenu()
-                                    if result == 'quit':
-                                        entered = False
-                                        break
-                                    viewLeagueRankings(result)
-                            case 'clubs':
-                                viewClubRankings()
-                            case 'players':
-                                while True:
-                                    result = playerRankingsMenu()
-                                    if result == 'quit':
-                                        entered = False
-                                        break
-                                    viewPlayerRankings(result)
-                            case 'quit':
-                                break
-                    continue
-        except QuitError:
-            continue
-        hero.viewProfile()
-        hero.club.viewProfile()
+                    case 'load-setup':
+                        waitForWorld()
+                        hero = loadSetup()
+                        if not hero:
+                            continue
+                    case 'new-hero':
+                        if setupFiles and not yesNoMenu('Are you sure you want to create a new hero?', default = 'No'):
+                            continue
+                        hero = Hero.fromInputs()
+                        saveSetup(hero)
+                    case 'settings':
+                        settings.edit()
+                        continue
+                    case 'new-world':
+                        if yesNoMenu('Are you sure you want to generate a new world? Every player in the current one will be gone.', default = 'No'):
+                            waitForWorld()
+                            deleteWorld()
+                            break
+                        continue
+                    case 'rankings':
+                        waitForWorld()
+                        entered = True
+                        while entered:
+                            result = rankingsMenu()
+                            match result:
+                                case 'nations':
+                                    while True:
+                                        result = nationRankingsMenu()
+                                        if result == 'quit':
+                                            entered = False
+                                            break
+                                        viewNationRankings(result)
+                                case 'leagues':
+                                    while True:
+                                        result = leagueRankingsMenu()
+                                        if result == 'quit':
+                                            entered = False
+                                            break
+                                        viewLeagueRankings(result)
+                                case 'clubs':
+                                    viewClubRankings()
+                                case 'players':
+                                    while True:
+                                        result = playerRankingsMenu()
+                                        if result == 'quit':
+                                            entered = False
+                                            break
+                                        viewPlayerRankings(result)
+                                case 'search':
+                                    viewSearch()
+                                case 'quit':
+                                    break
+                        continue
+            except QuitError:
+                continue
+            hero.viewProfile()
+            hero.club.viewProfile()
 
-        input('<rorange>There will be a career here soon... For now, though, press Enter:</rorange> ')
-        break
+            input('<rorange>There will be a career here soon... For now, though, press Enter:</rorange> ')
+            break
@@ -0,0 +1,44 @@
+from os.path import dirname, abspath, exists
+from shutil import copytree, copyfile
+from os import remove
+import sys
+
+import pytest
+
+sys.path.insert(0, dirname(dirname(abspath(__file__))))
+
+import career
+
+
+def copyCaches(source: str, target: str) -> None:
+    '''Copies the caches and the compiled frames of the database files in `source` to the ones in `target`, so that tests don't parse the database again.'''
+    for name, filePath in career.dbFiles.items():
+        for cacheOf in [career.cachePath, career.FrameStore.storePath]:
+            if exists(cacheOf(source + career.basename(filePath))):
+                copyfile(cacheOf(source + career.basename(filePath)), cacheOf(target + career.basename(filePath)))
+
+
+def removeCaches(directory: str) -> None:
+    '''Removes the caches and the compiled frames of every database file in `directory`.'''
+    for filePath in career.dbFiles.values():
+        for cacheOf in [career.cachePath, career.FrameStore.storePath]:
+            if exists(cacheOf(directory + career.basename(filePath))):
+                remove(cacheOf(directory + career.basename(filePath)))
+
+
+def squadRecords(world: career.World) -> list[list[tuple]]:
+    '''Returns the records of the players of every club and of the free agents, club by club.'''
+    return [[player.toRecord() for player in club.players] for club in world.clubs + [world.freeAgents]]
+
+
+@pytest.fixture
+def database(tmp_path):
+    '''Points the game at a copy of its database in `tmp_path` and yields the directory. Caches of the copy are removed afterwards.'''
+    original = career.dirs['db']
+    directory = str(tmp_path / 'database') + career.SLASH
+    copytree(original, directory)
+    copyCaches(original, directory)
+    career.setDatabaseDirectory(directory)
+    yield directory
+    removeCaches(directory)
+    career.setDatabaseDirectory(original)
@@ -0,0 +1,26 @@
+from io import StringIO
+
+import pytest
+
+import career
+
+
+@pytest.mark.parametrize('arguments', [['--seed'], ['--seed', 'abc'], ['--seed', '-3'], ['--seed', '1.5'], ['--benchmark', '--repeats', 'x'], ['--generate-database', 'big', '--scale', '--seed', '1']])
+def test_bad_number_arguments_print_usage(monkeypatch, arguments):
+    '''An option that needs a whole number is checked when the command line is parsed, and the user is told how to use it.'''
+    errors = StringIO()
+    monkeypatch.setattr(career, 'argv', ['career.py', *arguments])
+    monkeypatch.setattr(career, 'stderr', errors)
+    assert not career.checkArguments()
+    assert 'must be followed by a whole number' in errors.getvalue() and career.USAGE in errors.getvalue()
+    with pytest.raises(career.ValidationError):
+        for option in career.NUMBER_OPTIONS:
+            career.numberArgument(option)
+
+
+def test_seed_argument(monkeypatch):
+    '''A valid seed is read from the command line.'''
+    monkeypatch.setattr(career, 'argv', ['career.py', '--database', 'big', '--seed', '42'])
+    assert career.checkArguments()
+    assert career.requestedSeed() == 42
+    assert career.numberArgument('--scale') is None
@@ -0,0 +1,21 @@
+import career
+from conftest import removeCaches
+
+
+def test_scaled_database_keeps_ratings_in_range(database, tmp_path):
+    '''Every copy of a nation keeps its place relative to all nations, so free agents of a scaled database are rated like the ones of the original.'''
+    world = career.World()
+    world.generate(seed = 0, workers = 1)
+    originalRatings = [player.rating for player in world.freeAgents.players]
+    scaled = str(tmp_path / 'scaled') + career.SLASH
+    career.generateDatabase(scaled, 2)
+    try:
+        world = career.World(scaled)
+        world.generate(seed = 0, workers = 1)
+        assert len(world.nations) == 2 * len(career.loadData(database + 'nations.db'))
+        ratings = [player.rating for player in world.players]
+        assert 0 < min(ratings) and max(ratings) <= 100
+        scaledRatings = [player.rating for player in world.freeAgents.players]
+        assert abs(sum(scaledRatings) / len(scaledRatings) - sum(originalRatings) / len(originalRatings)) < 5
+    finally:
+        removeCaches(scaled)
@@ -0,0 +1,14 @@
+import career
+
+
+def test_find_index_is_sorted_after_rebuild_and_additions(database):
+    '''A rebuilt prefix index and one with a few clubs added after it are both sorted and hold every search option.'''
+    world = career.World()
+    world.generate(seed = 0, lazy = True)
+    career.Club.updateIndex()
+    expected = sorted((searchOption, number) for number, club in enumerate(career.Club.instances) for searchOption in club.searchOptions)
+    assert career.Club.prefixIndex == expected
+    club = career.Club(50, 'Testing Athletic Club', ['Testing Athletic'], 'The Testers', 'TST', ['ured', 'uwhite'])
+    career.Club.updateIndex()
+    assert career.Club.prefixIndex == sorted(expected + [(searchOption, len(career.Club.instances) - 1) for searchOption in club.searchOptions])
+    assert career.Club.find('testing athletic') is club
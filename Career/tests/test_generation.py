@@ -0,0 +1,68 @@
+import career
+from conftest import squadRecords
+
+
+def test_player_rankings_table_of_lazy_world(database):
+    '''The rankings table needs every player, so a lazy world whose squads were never opened is generated fully first.'''
+    world = career.World()
+    world.generate(seed = 0, lazy = True)
+    assert career.Player.instances == []
+    table = career.playerRankingsTable()
+    assert table.rowCount == len(career.Player.instances) > 0
+
+
+class WatchedList(list):
+    '''A list that counts how many times it was changed.'''
+    changes = 0
+
+    def append(self, item):
+        self.changes += 1
+        super().append(item)
+
+    def pop(self, *args):
+        self.changes += 1
+        return super().pop(*args)
+
+
+def test_create_leagues_leaves_nations_alone(database):
+    '''Leagues are made in a background thread while the main thread can search nations, so making them must not change `Nation.instances`.'''
+    career.World()
+    nations = career.Nation.instances = WatchedList(career.Nation.instances)
+    nationCount = career.Nation.N
+    career.createLeagues(newWorld = True, workers = 1, lazy = True, seed = 0, save = False)
+    assert career.Nation.instances is nations and nations.changes == 0
+    assert career.Nation.N == nationCount
+    assert career.freeAgents.nation not in nations
+
+
+def test_hero(database):
+    '''Heroes are the only players that are not made from records.'''
+    world = career.World()
+    world.generate(seed = 0, lazy = True)
+    hero = career.Hero({'fullName': 'Test Hero', 'shirtName': 'Hero', 'nation': world.nations[0].ucName, 'pac': 60, 'sho': 60, 'pas': 60, 'dri': 60, 'dfn': 60, 'phy': 60, 'foot': 'left', 'traits': [1], 'club': None})
+    assert career.Player.instances[-1] is hero
+    assert hero.squad == 'U18' and 80 <= hero.potential <= 95 and hero.age == career.DEFAULT_PLAYER_AGE
+    assert max(hero.suit) == 0 and 0 < hero.rating <= career.MAX_ATTRIBUTE_VALUE
+
+
+def test_generation_is_deterministic(database, monkeypatch):
+    '''The same seed gives the same players whether squads are made in one process, in several processes or lazily.'''
+    pools = []
+    class WatchedPool(career.ProcessPoolExecutor):
+        def map(self, *args, **kwargs):
+            pools.append(self)
+            return super().map(*args, **kwargs)
+    monkeypatch.setattr(career, 'ProcessPoolExecutor', WatchedPool)
+    world = career.World()
+    world.generate(seed = 3, workers = 1)
+    serial = squadRecords(world)
+    assert sum(map(len, serial)) == len(world.players) > 0
+    assert pools == []
+    world.generate(seed = 3, workers = 2)
+    assert pools
+    assert squadRecords(world) == serial
+    world.generate(seed = 3, lazy = True)
+    career.genPendingSquads()
+    assert squadRecords(world) == serial
+    world.generate(seed = 4, workers = 1)
+    assert squadRecords(world) != serial
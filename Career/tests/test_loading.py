@@ -0,0 +1,59 @@
+from concurrent.futures import ThreadPoolExecutor
+
+import career
+from conftest import removeCaches
+
+
+def test_load_steps_with_compiled_frames_and_stale_cache(database):
+    '''Frames are left out of the preloaded files when their store is compiled, which must not break waiting for the other files.'''
+    career.FrameStore.load(career.files['frames'])
+    assert career.FrameStore.isCompiled(career.files['frames'])
+    with open(career.files['leagues'], 'ab') as f:
+        f.write(b'\n# edited\n')
+    assert not career.isCached(career.files['leagues'])
+    steps = [
+        career.LoadStep('leagues', lambda progress, bar, task, value: career.loadData(career.files['leagues']), ['leagues']),
+        career.LoadStep('frames', lambda progress, bar, task, value: career.FrameStore.load(career.files['frames']), ['frames'], ['leagues']),
+    ]
+    errorList = []
+    outputs = career.runLoadSteps([], steps, errorList)
+    assert errorList == []
+    assert set(outputs) == {'leagues', 'frames'}
+
+
+def test_preload_parses_inline_when_pool_does_not_pay_off(database, monkeypatch):
+    '''A process pool is only started on a machine with several CPUs, and only when there is enough to parse besides the biggest file.'''
+    pools = []
+    monkeypatch.setattr(career, 'ProcessPoolExecutor', lambda workers, **kwargs: pools.append(workers) or ThreadPoolExecutor(workers))
+    monkeypatch.setattr(career, 'PRELOAD_POOL_MIN_SIZE', 20_000)
+    filePaths = [career.files['leagues'], career.files['nations'], career.files['traits']]
+    monkeypatch.setattr(career, 'cpuCount', lambda: 1)
+    removeCaches(database)
+    career.preloadFiles(filePaths)
+    assert pools == []
+    monkeypatch.setattr(career, 'cpuCount', lambda: 4)
+    removeCaches(database)
+    career.preloadFiles([career.files['leagues'], career.files['traits']])
+    assert pools == []
+    removeCaches(database)
+    career.preloadFiles(filePaths)
+    assert pools == [3]
+    assert all(career.loadData(filePath) for filePath in filePaths)
+
+
+def test_edited_database_file_refreshes_its_cache(database):
+    '''Editing a database file changes the hash of its contents, so its cache is missed, the file is parsed again and the cache is replaced.'''
+    filePath = career.files['leagues']
+    career.loadData(filePath)
+    assert career.isCached(filePath)
+    with open(career.cachePath(filePath), 'rb') as f:
+        oldKey = f.readline().rstrip(b'\n').decode()
+    with open(filePath, 'rb') as f:
+        contents = f.read().replace(b'- name: Premier League', b'- name: Premier Division', 1)
+    with open(filePath, 'wb') as f:
+        f.write(contents)
+    assert not career.isCached(filePath)
+    assert career.loadData(filePath)[0]['name'] == 'Premier Division'
+    assert career.isCached(filePath)
+    assert career.loadCache(filePath, oldKey) is None
+    assert career.loadCache(filePath, career.yamlToHash(contents))[0]['name'] == 'Premier Division'
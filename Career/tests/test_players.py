@@ -0,0 +1,16 @@
+import career
+
+
+def test_pure_descriptions_of_squad(database):
+    '''Describing a whole squad at once gives the same descriptions as describing every player, and a changed player is described again.'''
+    world = career.World()
+    world.generate(seed = 0, workers = 1)
+    players = world.clubs[0].players
+    expected = [max(player.descriptionDict.items(), key = lambda item: item[1])[0] for player in players]
+    assert career.Player.pureDescriptions(players) == expected
+    assert career.Player.descriptions(players) == [player.description for player in players]
+    player = players[0]
+    player.age = 17
+    player.pac = career.MAX_ATTRIBUTE_VALUE
+    assert player.descriptionCache is None
+    assert career.Player.pureDescriptions([player]) == [max(player.descriptionDict.items(), key = lambda item: item[1])[0]]
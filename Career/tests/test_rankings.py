@@ -0,0 +1,38 @@
+import career
+
+
+def test_rankings_build_skips_players_made_after_update(database):
+    '''A player made by another thread after `update()` must not break building a ranking, and is ranked by the next query.'''
+    world = career.World()
+    world.generate(seed = 0, workers = 1)
+    career.rankings.top(1)
+    newPlayer = career.Player.fromRecord(career.Player.instances[0].toRecord())
+    newPlayer.club = career.Club.instances[0]
+    career.rankings.build('potential', 'club')
+    assert newPlayer not in career.rankings.entries['potential', 'club']
+    assert newPlayer in career.rankings.top(len(career.Player.instances), 'potential', 'club', career.Club.instances[0])
+
+
+def test_changed_player_updates_ratings_and_rankings(database):
+    '''Changing the attributes of a player clears the cached ratings of the club and its league, and moves the player in every ranking.'''
+    world = career.World()
+    world.generate(seed = 0, workers = 1)
+    league = world.leagues[0]
+    club = league.sortedClubs[-1]
+    player = min(club.players, key = lambda player: player.rating)
+    attributes = player.attributes
+    clubRating, leagueRating, leagueTop = club.rating, league.getRating(), league.getRating('top')
+    worldPlace = career.rankings.top(len(world.players)).index(player)
+    assert career.rankings.top(1, 'rating', 'club', club) != [player]
+    assert career.rankings.top(1, 'rating', 'league', league) != [player]
+    player.attributes = [career.MAX_ATTRIBUTE_VALUE] * 6
+    assert club.rating > clubRating
+    assert league.getRating() > leagueRating
+    assert league.getRating('top') >= leagueTop
+    assert career.rankings.top(1, 'rating', 'club', club) == [player]
+    assert career.rankings.top(1, 'rating', 'league', league) == [player]
+    assert career.rankings.top(len(world.players)).index(player) < worldPlace
+    player.attributes = attributes
+    assert club.rating == clubRating and league.getRating() == leagueRating
+    assert career.rankings.top(len(world.players)).index(player) == worldPlace
+    assert career.rankings.top(1, 'rating', 'club', club) != [player]
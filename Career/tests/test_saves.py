@@ -0,0 +1,53 @@
+import pytest
+
+import career
+from conftest import squadRecords
+
+
+@pytest.fixture
+def worldFile(tmp_path, monkeypatch):
+    '''Makes `createLeagues()` save and restore the world in `tmp_path` instead of the saves of the game, and yields the path of the world file.'''
+    filePath = str(tmp_path / 'world.wld')
+    loadWorld, saveWorld = career.loadWorld, career.saveWorld
+    monkeypatch.setattr(career, 'loadWorld', lambda: loadWorld(filePath))
+    monkeypatch.setattr(career, 'saveWorld', lambda: saveWorld(filePath))
+    yield filePath
+
+
+def test_saved_world_is_restored(database, worldFile):
+    '''A world saved from the current database is restored with the same players instead of being generated again.'''
+    world = career.World()
+    world.generate(seed = 5, workers = 1, save = True)
+    saved = squadRecords(world)
+    assert career.loadWorld()['seed'] == 5
+    world.load()
+    assert squadRecords(world) == saved
+    assert career.Streams.seed == 5
+
+
+def test_stale_world_is_generated_again(database, worldFile):
+    '''A world saved before the database was edited is not restored, and a new one is generated and saved over it.'''
+    world = career.World()
+    world.generate(seed = 5, workers = 1, save = True)
+    saved = squadRecords(world)
+    with open(career.files['names'], 'ab') as f:
+        f.write(b'\n# edited\n')
+    assert career.loadWorld() is None
+    world.load()
+    assert squadRecords(world) != saved
+    assert career.loadWorld()['key'] == career.worldKey()
+
+
+@pytest.mark.parametrize('corruption', [lambda contents: b'not a world', lambda contents: contents[:len(contents) // 2], lambda contents: career.compress(b'not a pickle')])
+def test_corrupt_world_is_generated_again(database, worldFile, corruption):
+    '''A saved world that can't be read is not restored, and a new one is generated and saved over it.'''
+    world = career.World()
+    world.generate(seed = 5, workers = 1, save = True)
+    with open(worldFile, 'rb') as f:
+        contents = f.read()
+    with open(worldFile, 'wb') as f:
+        f.write(corruption(contents))
+    assert career.loadWorld() is None
+    world.load()
+    assert world.players
+    assert career.loadWorld() is not None